@@ -1,18 +1,107 @@
+import base64
+import hashlib
+import hmac
 import json
 import os
+import re
+import time
 import boto3
+from urllib.parse import quote, urlsplit
+from collections import OrderedDict
 from datetime import datetime
-from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
 from botocore.exceptions import ClientError
 from botocore.client import Config
 
-dynamodb = boto3.resource('dynamodb')
-profiles_table = dynamodb.Table(os.environ['PROFILES_TABLE'])
-users_table = dynamodb.Table(os.environ['USERS_TABLE'])
+# orjson (C + SIMD JSON) is used when bundled with the deployment package;
+# fall back to stdlib json so the function still runs without it
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    def _loads(data):
+        return orjson.loads(data)
+
+    def _dumps(obj):
+        # API Gateway expects a str body; orjson emits bytes.
+        # default=str covers Decimal values coming back from DynamoDB.
+        return orjson.dumps(obj, default=str).decode()
+else:
+    def _loads(data):
+        return json.loads(data)
+
+    def _dumps(obj):
+        return json.dumps(obj, default=str)
+
+# Shared client config: keep-alive + a pool large enough for the DynamoDB and
+# S3 calls a single invocation makes, so warm invocations reuse TLS connections
+_BOTO_CFG = Config(
+    signature_version='s3v4',
+    tcp_keepalive=True,
+    max_pool_connections=20,
+    retries={'mode': 'standard', 'max_attempts': 3},
+    connect_timeout=1,
+    read_timeout=3
+)
+
+# Explicit session so all tables share one underlying HTTP connection pool.
+# The low-level client is used instead of the Resource layer: Resource wraps
+# every attribute in pure-Python converters on both directions, which is
+# O(total attributes) overhead for the large nested profile items. The shared
+# (de)serializers below do that conversion once per item instead.
+session = boto3.session.Session()
+ddb = session.client('dynamodb', config=_BOTO_CFG)
+PROFILES_TABLE_NAME = os.environ['PROFILES_TABLE']
+USERS_TABLE_NAME = os.environ['USERS_TABLE']
+# Optional - the links section of public profiles is skipped when unset
+LINKS_TABLE_NAME = os.environ.get('LINKS_TABLE', '')
+
+# When a DAX cluster is configured (and the amazondax client is bundled with
+# the deployment package), route table calls through it - the client exposes
+# the same attribute-value API, so everything below works unchanged. Falls
+# back to plain DynamoDB if the endpoint or the package is missing.
+_DAX_ENDPOINT = os.environ.get('DAX_ENDPOINT', '')
+if _DAX_ENDPOINT:
+    try:
+        from amazondax import AmazonDaxClient
+        ddb = AmazonDaxClient(session, endpoints=[_DAX_ENDPOINT])
+    except Exception as dax_error:
+        print(f"WARNING: DAX_ENDPOINT set but DAX client unavailable, using DynamoDB: {dax_error}")
+
+_DDB_SERIALIZER = TypeSerializer()
+_DDB_DESERIALIZER = TypeDeserializer()
+
+def _to_ddb(obj):
+    """Serialize a plain dict into DynamoDB attribute-value form"""
+    serialize = _DDB_SERIALIZER.serialize
+    return {k: serialize(v) for k, v in obj.items()}
+
+def _from_ddb(item):
+    """Deserialize a DynamoDB attribute-value item into a plain dict"""
+    deserialize = _DDB_DESERIALIZER.deserialize
+    return {k: deserialize(v) for k, v in item.items()}
 
 # S3 client for generating presigned URLs
 s3_bucket_name = os.environ.get('S3_BUCKET', '')
-s3_client = boto3.client('s3', config=Config(signature_version='s3v4')) if s3_bucket_name else None
+s3_client = session.client('s3', config=_BOTO_CFG) if s3_bucket_name else None
+
+# Pre-warm during the INIT phase so the first invocation doesn't pay for lazy
+# service-model loading, endpoint resolution, or SigV4 signer setup. These are
+# local operations (the presign never hits the network) and any failure here
+# must not prevent the function from starting.
+try:
+    ddb.meta.service_model.operation_names
+    if s3_client:
+        s3_client.meta.service_model.operation_names
+        s3_client.generate_presigned_url(
+            'get_object',
+            Params={'Bucket': s3_bucket_name, 'Key': 'warmup'},
+            ExpiresIn=60
+        )
+except Exception:
+    pass
 
 # Logging helper - only log detailed debug info in non-production environments
 ENVIRONMENT = os.environ.get('ENVIRONMENT', 'dev')
@@ -26,14 +115,20 @@ def log_debug(message, data=None):
         else:
             print(f"DEBUG: {message}")
 
+# traceback is imported on first use and cached so repeat failures skip the
+# importlib machinery; the happy path never pays for the import at all
+_TRACEBACK = None
+
 def log_error(message, error=None, include_traceback=False):
     """Log errors - always log, but sanitize in production"""
+    global _TRACEBACK
     if error:
         error_type = type(error).__name__
         print(f"ERROR: {message} - {error_type}: {str(error)}")
         if include_traceback:
-            import traceback
-            print(traceback.format_exc())
+            if _TRACEBACK is None:
+                import traceback as _TRACEBACK
+            print(_TRACEBACK.format_exc())
     else:
         print(f"ERROR: {message}")
 
@@ -46,27 +141,15 @@ def log_info(message, data=None):
 
 # CORS headers - must match origin exactly when using credentials
 # Note: When allow_credentials is true, cannot use wildcard '*'
-def get_cors_headers(origin=None):
-    """Get CORS headers based on request origin"""
-    # Get allowed origins from environment variable, fallback to localhost for development
-    cors_origins_env = os.environ.get('CORS_ORIGINS', '')
-    if cors_origins_env:
-        allowed_origins = [origin.strip() for origin in cors_origins_env.split(',') if origin.strip()]
-    else:
-        # Fallback for development
-        allowed_origins = ['http://localhost:8080', 'http://localhost:3000']
-    
-    # If origin is provided and in allowed list, use it; otherwise use first allowed
-    if origin and origin in allowed_origins:
-        allowed_origin = origin
-    elif origin and origin.startswith('http://localhost') and not cors_origins_env:
-        # Allow any localhost port for development only (if no env var set)
-        allowed_origin = origin
-    elif allowed_origins:
-        allowed_origin = allowed_origins[0]  # Default to first allowed origin
-    else:
-        allowed_origin = '*'  # Fallback (should not happen in production)
-    
+# CORS_ORIGINS is env-driven and stable per container, so parse it once at import
+_CORS_ORIGINS_ENV = os.environ.get('CORS_ORIGINS', '')
+if _CORS_ORIGINS_ENV:
+    _ALLOWED_ORIGINS = [o.strip() for o in _CORS_ORIGINS_ENV.split(',') if o.strip()]
+else:
+    # Fallback for development
+    _ALLOWED_ORIGINS = ['http://localhost:8080', 'http://localhost:3000']
+
+def _build_cors_headers(allowed_origin):
     return {
         'Access-Control-Allow-Origin': allowed_origin,
         'Access-Control-Allow-Credentials': 'true',  # Required when using Authorization header
@@ -76,101 +159,295 @@ def get_cors_headers(origin=None):
         'Content-Type': 'application/json'
     }
 
+# Precomputed origin -> headers table; the hot path is a single dict lookup.
+# Returned dicts are shared across requests and must not be mutated.
+_CORS_TABLE = {o: _build_cors_headers(o) for o in _ALLOWED_ORIGINS}
+_DEFAULT_CORS = _build_cors_headers(_ALLOWED_ORIGINS[0] if _ALLOWED_ORIGINS else '*')
+
+def get_cors_headers(origin=None):
+    """Get CORS headers based on request origin"""
+    headers = _CORS_TABLE.get(origin)
+    if headers:
+        return headers
+    if origin and origin.startswith('http://localhost') and not _CORS_ORIGINS_ENV:
+        # Allow any localhost port for development only (if no env var set);
+        # cache the built headers so repeat dev requests hit the table too
+        return _CORS_TABLE.setdefault(origin, _build_cors_headers(origin))
+    return _DEFAULT_CORS
+
 # Default CORS headers for backward compatibility
 CORS_HEADERS = get_cors_headers()
 
+# Compiled once - validating a username must not re-enter the re cache per call
+_USERNAME_RE = re.compile(r'^[a-z0-9_-]{3,20}\Z')
+
+# Availability answers are cached briefly per container so signup-form
+# keystroke probes don't each cost a DynamoDB read. Staleness is bounded by
+# the TTL and harmless: the conditional put on profile creation remains the
+# authoritative uniqueness check. Taken names are pinned longer since they
+# effectively never free up.
+_USERNAME_CHECK_CACHE = {}
+_USERNAME_CHECK_MAX = 4096
+_USERNAME_CHECK_TTL = 30
+_USERNAME_TAKEN_TTL = 3600
+
+def _username_check_put(username, available):
+    if len(_USERNAME_CHECK_CACHE) >= _USERNAME_CHECK_MAX:
+        _USERNAME_CHECK_CACHE.clear()
+    ttl = _USERNAME_CHECK_TTL if available else _USERNAME_TAKEN_TTL
+    _USERNAME_CHECK_CACHE[username] = (available, time.time() + ttl)
+
+# Canned error bodies, JSON-encoded once at import so hot paths return
+# pre-baked strings instead of re-serializing the same dict per request
+_ERR_INTERNAL = _dumps({'error': 'Internal server error', 'message': 'An error occurred processing your request'})
+_ERR_UNAUTHORIZED = _dumps({'error': 'Unauthorized', 'message': 'No user_id found in JWT claims'})
+_ERR_METHOD_NOT_ALLOWED = _dumps({'error': 'Method not allowed'})
+_ERR_INVALID_JSON = _dumps({'error': 'Invalid JSON in request body', 'message': 'Request body must be valid JSON'})
+_ERR_USERNAME_REQUIRED = _dumps({'error': 'Validation error', 'message': 'username is required'})
+_ERR_USERNAME_TAKEN = _dumps({'error': 'Username taken', 'message': 'This username is already in use'})
+_ERR_PROFILE_NOT_FOUND = _dumps({'error': 'Profile not found'})
+_ERR_USERNAME_PARAM_REQUIRED = _dumps({'error': 'Username parameter is required'})
+_ERR_SAVE_PROFILE = _dumps({'error': 'Internal server error', 'message': 'An error occurred saving your profile'})
+_ERR_GET_OWN_PROFILE = _dumps({'error': 'Internal server error', 'message': 'An error occurred retrieving your profile'})
+_ERR_GET_PROFILE = _dumps({'error': 'Internal server error', 'message': 'An error occurred retrieving the profile'})
+
+# Container-local profile cache: repeat reads of the same username within the
+# TTL skip the DynamoDB round trip. Writes through this container invalidate
+# eagerly; the short TTL bounds staleness from writes via other containers.
+_PROFILE_CACHE = OrderedDict()
+_PROFILE_CACHE_MAX = 1024
+_PROFILE_CACHE_TTL = 30
+
+def _profile_cache_get(username):
+    """Return a still-fresh cached profile item for username, or None"""
+    entry = _PROFILE_CACHE.get(username)
+    if entry and entry[1] > time.time():
+        _PROFILE_CACHE.move_to_end(username)
+        # Callers mutate the item during hydration - hand out a copy
+        return dict(entry[0])
+    return None
+
+def _profile_cache_put(username, item):
+    _PROFILE_CACHE[username] = (item, time.time() + _PROFILE_CACHE_TTL)
+    _PROFILE_CACHE.move_to_end(username)
+    if len(_PROFILE_CACHE) > _PROFILE_CACHE_MAX:
+        _PROFILE_CACHE.popitem(last=False)
+
+def _profile_cache_invalidate(username):
+    _PROFILE_CACHE.pop(username, None)
+
+# Presigned URLs are cached across warm invocations so repeated requests for the
+# same key skip the SigV4 signing work. functools.lru_cache can't expire entries,
+# so this is a small LRU (OrderedDict) storing (url, expires_at_epoch) per key.
+_PRESIGN_CACHE = OrderedDict()
+_PRESIGN_CACHE_MAX = 512
+_PRESIGN_EXPIRES_IN = 900  # 15 minutes
+_PRESIGN_SAFETY_MARGIN = 60  # never serve a URL about to expire
+
+def _presign_cache_get(key):
+    """Return a still-valid cached presigned URL for key, or None"""
+    cache_key = (s3_bucket_name, key)
+    entry = _PRESIGN_CACHE.get(cache_key)
+    if entry and entry[1] - time.time() > _PRESIGN_SAFETY_MARGIN:
+        _PRESIGN_CACHE.move_to_end(cache_key)
+        return entry[0]
+    return None
+
+def _presign_cache_put(key, url):
+    """Store a freshly generated presigned URL, evicting the oldest entry if full"""
+    cache_key = (s3_bucket_name, key)
+    _PRESIGN_CACHE[cache_key] = (url, time.time() + _PRESIGN_EXPIRES_IN)
+    _PRESIGN_CACHE.move_to_end(cache_key)
+    if len(_PRESIGN_CACHE) > _PRESIGN_CACHE_MAX:
+        _PRESIGN_CACHE.popitem(last=False)
+
+# Fast SigV4 presigner: generate_presigned_url runs the full botocore pipeline
+# (operation model lookup, endpoint resolution, canonical request build) per
+# call, but for GET-with-fixed-expiry the URL shape is fully predictable.
+# Signing locally reduces each URL to a few string formats plus one HMAC chain.
+_REGION = session.region_name or os.environ.get('AWS_REGION') or 'us-east-1'
+_S3_HOST = f"{s3_bucket_name}.s3.{_REGION}.amazonaws.com" if s3_bucket_name else None
+_credentials = session.get_credentials()
+
+def _derive_signing_key(secret_key, date_stamp):
+    """SigV4 key derivation: four chained HMAC-SHA256 rounds"""
+    k_date = hmac.new(('AWS4' + secret_key).encode(), date_stamp.encode(), hashlib.sha256).digest()
+    k_region = hmac.new(k_date, _REGION.encode(), hashlib.sha256).digest()
+    k_service = hmac.new(k_region, b's3', hashlib.sha256).digest()
+    return hmac.new(k_service, b'aws4_request', hashlib.sha256).digest()
+
+# The derived signing key only changes when the UTC date or the credentials
+# roll over, so cache it per (secret, date) and the per-URL cost drops from
+# five HMAC rounds to one. At most one entry is live at a time.
+_SIGNING_KEY_CACHE = {}
+
+def _get_signing_key(secret_key, date_stamp):
+    cache_key = (secret_key, date_stamp)
+    signing_key = _SIGNING_KEY_CACHE.get(cache_key)
+    if signing_key is None:
+        _SIGNING_KEY_CACHE.clear()
+        signing_key = _SIGNING_KEY_CACHE[cache_key] = _derive_signing_key(secret_key, date_stamp)
+    return signing_key
+
+def _fast_presign(key, expires=_PRESIGN_EXPIRES_IN):
+    """Build a presigned GET URL directly; returns None if signing isn't possible"""
+    if not _S3_HOST or not _credentials:
+        return None
+    creds = _credentials.get_frozen_credentials()
+
+    now = datetime.utcnow()
+    amz_date = now.strftime('%Y%m%dT%H%M%SZ')
+    date_stamp = now.strftime('%Y%m%d')
+    credential_scope = f"{date_stamp}/{_REGION}/s3/aws4_request"
+    canonical_uri = '/' + quote(key, safe='/')
+
+    # Query parameters must stay sorted by name for the canonical request
+    query = [
+        ('X-Amz-Algorithm', 'AWS4-HMAC-SHA256'),
+        ('X-Amz-Credential', f"{creds.access_key}/{credential_scope}"),
+        ('X-Amz-Date', amz_date),
+        ('X-Amz-Expires', str(expires)),
+    ]
+    if creds.token:
+        query.append(('X-Amz-Security-Token', creds.token))
+    query.append(('X-Amz-SignedHeaders', 'host'))
+    canonical_query = '&'.join(f"{k}={quote(v, safe='')}" for k, v in query)
+
+    canonical_request = (
+        f"GET\n{canonical_uri}\n{canonical_query}\n"
+        f"host:{_S3_HOST}\n\nhost\nUNSIGNED-PAYLOAD"
+    )
+    string_to_sign = (
+        f"AWS4-HMAC-SHA256\n{amz_date}\n{credential_scope}\n"
+        f"{hashlib.sha256(canonical_request.encode()).hexdigest()}"
+    )
+    signing_key = _get_signing_key(creds.secret_key, date_stamp)
+    signature = hmac.new(signing_key, string_to_sign.encode(), hashlib.sha256).hexdigest()
+
+    return f"https://{_S3_HOST}{canonical_uri}?{canonical_query}&X-Amz-Signature={signature}"
+
 def _get_resume_url_from_key(resume_key):
     """Generate presigned S3 URL from resume key (15 minutes expiration)"""
-    print(f"DEBUG: _get_resume_url_from_key called with key: {resume_key}")
-    print(f"DEBUG: s3_client exists: {s3_client is not None}, s3_bucket_name: {s3_bucket_name}")
-    
     if not resume_key:
-        print("WARN: resume_key is empty or None")
+        log_debug("resume_key is empty or None")
         return None
-    
-    if not s3_client:
-        print("ERROR: s3_client is not initialized")
-        return None
-    
-    if not s3_bucket_name:
-        print("ERROR: s3_bucket_name is not set")
+
+    if not s3_client or not s3_bucket_name:
+        log_error("S3 client or bucket name is not configured")
         return None
-    
+
+    cached_url = _presign_cache_get(resume_key)
+    if cached_url:
+        return cached_url
+
     try:
-        print(f"DEBUG: Generating presigned URL for bucket: {s3_bucket_name}, key: {resume_key}")
-        presigned_url = s3_client.generate_presigned_url(
-            'get_object',
-            Params={
-                'Bucket': s3_bucket_name,
-                'Key': resume_key,
-            },
-            ExpiresIn=900,  # 15 minutes
-            HttpMethod='GET'
-        )
-        print(f"DEBUG: Successfully generated presigned URL: {presigned_url[:100]}...")
+        log_debug(f"Generating presigned URL for key: {resume_key}")
+        presigned_url = _fast_presign(resume_key)
+        if not presigned_url:
+            # Fall back to the boto3 presigner if local signing isn't possible
+            presigned_url = s3_client.generate_presigned_url(
+                'get_object',
+                Params={
+                    'Bucket': s3_bucket_name,
+                    'Key': resume_key,
+                },
+                ExpiresIn=_PRESIGN_EXPIRES_IN,
+                HttpMethod='GET'
+            )
+        _presign_cache_put(resume_key, presigned_url)
         return presigned_url
     except Exception as e:
-        print(f"ERROR: Failed to generate presigned URL for resume: {str(e)}")
-        import traceback
-        print(f"ERROR: Traceback: {traceback.format_exc()}")
+        log_error("Failed to generate presigned URL for resume", e, include_traceback=IS_DEBUG)
         return None
 
+def _s3_key_from_url(url):
+    """Return the object key if url points at an S3 bucket host, else None.
+
+    urlsplit is C-accelerated and avoids the substring-search + split + index
+    dance this used to do on every write that carried a full S3 URL.
+    """
+    parts = urlsplit(url)
+    if parts.hostname and parts.hostname.endswith('.s3.amazonaws.com'):
+        return parts.path.lstrip('/')
+    return None
+
 def _get_resume_url(profile):
     """Get resume URL from profile, generating presigned URL from resume_key if needed"""
-    print(f"DEBUG: _get_resume_url called with profile keys: {list(profile.keys()) if profile else 'None'}")
     resume_url = profile.get('resume_url') or profile.get('resumeUrl')
     resume_key = profile.get('resume_key')
-    
-    print(f"DEBUG: _get_resume_url - resume_url: {resume_url}, resume_key: {resume_key}")
-    
+
     # If resume_url exists but is a direct S3 URL (not presigned), regenerate as presigned
-    if resume_url and 's3.amazonaws.com' in resume_url and 'X-Amz-Signature' not in resume_url:
-        print("DEBUG: resume_url is direct S3 URL (not presigned), regenerating...")
-        if resume_key:
-            new_url = _get_resume_url_from_key(resume_key)
-            print(f"DEBUG: Regenerated URL: {new_url[:100] if new_url else 'None'}...")
-            return new_url or resume_url
-        return resume_url
-    
     if resume_url:
-        print(f"DEBUG: Using existing resume_url: {resume_url[:100]}...")
+        parts = urlsplit(resume_url)
+        if (parts.hostname and parts.hostname.endswith('.s3.amazonaws.com')
+                and parts.query.find('X-Amz-Signature') < 0):
+            log_debug("resume_url is direct S3 URL (not presigned), regenerating")
+            if resume_key:
+                return _get_resume_url_from_key(resume_key) or resume_url
+            return resume_url
+
+    if resume_url:
         return resume_url
-    
+
     # If resume_key exists but resume_url doesn't, generate the presigned URL
     if resume_key:
-        print(f"DEBUG: resume_key exists but no resume_url, generating from key...")
         generated_url = _get_resume_url_from_key(resume_key)
         if generated_url:
-            print(f"DEBUG: Generated resume_url from key: {generated_url[:100]}...")
             return generated_url
-        else:
-            print("WARN: Failed to generate resume_url from key")
-    else:
-        print("DEBUG: No resume_key found in profile")
-    
-    print("DEBUG: Returning empty string for resume_url")
+        log_debug("Failed to generate resume_url from key")
+
     return ''
 
 def _get_avatar_url_from_key(avatar_key):
     """Generate presigned S3 URL from avatar key (15 minutes expiration)"""
     if not avatar_key or not s3_client or not s3_bucket_name:
         return None
-    
+
+    cached_url = _presign_cache_get(avatar_key)
+    if cached_url:
+        return cached_url
+
     try:
-        presigned_url = s3_client.generate_presigned_url(
-            'get_object',
-            Params={
-                'Bucket': s3_bucket_name,
-                'Key': avatar_key,
-            },
-            ExpiresIn=900,  # 15 minutes
-            HttpMethod='GET'
-        )
+        presigned_url = _fast_presign(avatar_key)
+        if not presigned_url:
+            # Fall back to the boto3 presigner if local signing isn't possible
+            presigned_url = s3_client.generate_presigned_url(
+                'get_object',
+                Params={
+                    'Bucket': s3_bucket_name,
+                    'Key': avatar_key,
+                },
+                ExpiresIn=_PRESIGN_EXPIRES_IN,
+                HttpMethod='GET'
+            )
+        _presign_cache_put(avatar_key, presigned_url)
         return presigned_url
     except Exception as e:
         print(f"ERROR: Failed to generate presigned URL for avatar: {str(e)}")
         return None
 
+def _hydrate_profile(item, include_resume=True, include_avatar=True):
+    """Inject presigned avatar/resume URLs derived from the stored S3 keys.
+
+    URLs are not persisted on the item - only the keys are stored - so they
+    are generated (and cached) at read time. Legacy items that still carry a
+    stored URL fall back to it when no key is available. Pass
+    include_resume=False / include_avatar=False when the caller won't expose
+    the URL, so hidden assets never pay for a signing operation.
+    """
+    if include_avatar:
+        avatar_url = item.get('avatar_url') or item.get('profile_image_url', '')
+        avatar_key = item.get('avatar_key')
+        if avatar_key:
+            avatar_url = _get_avatar_url_from_key(avatar_key) or avatar_url
+    else:
+        avatar_url = ''
+    item['avatar_url'] = avatar_url
+    # Keep profile_image_url for backward compatibility
+    item['profile_image_url'] = avatar_url
+    item['resume_url'] = _get_resume_url(item) if include_resume else ''
+    return item
+
 def get_user_id_from_event(event):
     """Extract user_id from JWT claims"""
     try:
@@ -198,112 +475,116 @@ def get_user_id_from_event(event):
         log_debug("No user_id found in authorizer claims")
         if IS_DEBUG:
             # Only log authorizer structure in debug mode (may contain sensitive data)
-            print(f"DEBUG: Authorizer keys: {list(authorizer.keys())}")
+            print(f"DEBUG: Authorizer keys: {','.join(authorizer)}")
         return None
     except Exception as e:
         log_error("Error extracting user_id", e, include_traceback=IS_DEBUG)
         return None
 
+def _match_dynamic(http_method, path):
+    """Match routes with a dynamic path segment"""
+    if http_method != 'GET' or not path:
+        return None
+    if '/username/check' in path:
+        return check_username_availability
+    if path.startswith('/profiles/'):
+        return get_public_profile
+    return None
+
 def handler(event, context):
-    # Log invocation start (minimal info)
-    log_info("Lambda invocation started")
-    if IS_DEBUG:
-        print(f"DEBUG: Event keys: {list(event.keys())}")
-        # Only log full event in debug mode (may contain sensitive data)
-        # print(f"DEBUG: Full event: {json.dumps(event, default=str)}")
-    
     # Get origin from request headers for CORS
     request_headers = event.get('headers', {}) or {}
     origin = request_headers.get('origin') or request_headers.get('Origin') or None
-    
-    # Try API Gateway HTTP API v2 format first
+
+    # Try API Gateway HTTP API v2 format first, fall back to v1
     request_context = event.get('requestContext', {})
     http_context = request_context.get('http', {})
-    http_method = http_context.get('method')
-    path = http_context.get('path') or event.get('rawPath')
-    
-    log_debug(f"HTTP API v2 - method: {http_method}, path: {path}")
-    
-    # Fallback to API Gateway v1 format if v2 format not found
-    if not http_method:
-        http_method = request_context.get('httpMethod')
-        log_debug(f"Fallback to v1 - method: {http_method}")
-    if not path:
-        path = event.get('path') or request_context.get('path')
-        log_debug(f"Fallback path: {path}")
-    
-    log_debug(f"Final method: {http_method}, Final path: {path}")
+    http_method = http_context.get('method') or request_context.get('httpMethod')
+    path = http_context.get('path') or event.get('rawPath') or event.get('path') or request_context.get('path')
+
+    # Handle OPTIONS (CORS preflight) before any other work - browsers hit it
+    # constantly, so the preflight path stays minimal
+    if http_method == 'OPTIONS':
+        return {
+            'statusCode': 200,
+            'headers': get_cors_headers(origin),
+            'body': ''
+        }
+
+    log_info("Lambda invocation started")
+    log_debug(f"Method: {http_method}, path: {path}")
     if IS_DEBUG:
         # Only log headers/query params in debug mode (may contain sensitive data)
-        log_debug(f"Headers keys: {list(request_headers.keys())}")
+        log_debug(f"Headers keys: {','.join(request_headers)}")
         log_debug(f"Query params: {event.get('queryStringParameters', {})}")
-    
+
     # Get CORS headers for this request (will be used by all functions)
     cors_headers = get_cors_headers(origin)
-    
+
     try:
-        # Handle OPTIONS (CORS preflight) first, before path normalization
-        if http_method == 'OPTIONS':
-            log_debug("OPTIONS request detected - Handling CORS preflight")
-            # Handle CORS preflight for any endpoint
-            # Get the origin from the request headers for proper CORS response
-            request_headers = event.get('headers', {}) or {}
-            origin = request_headers.get('origin') or request_headers.get('Origin') or '*'
-            
-            # Get CORS headers with proper origin and credentials
-            cors_response_headers = get_cors_headers(origin)
-            
-            log_debug(f"OPTIONS response - origin: {origin}")
-            
-            response = {
-                'statusCode': 200,
-                'headers': cors_response_headers,
-                'body': ''
-            }
-            
-            return response
-        
         # Normalize path (remove trailing slash, handle query params)
         if path:
             # Remove query string if present
             path = path.split('?')[0]
             path = path.rstrip('/')
-        
-        # Check if this is the username check endpoint
-        if http_method == 'GET' and path and '/username/check' in path:
-            log_debug("Routing to check_username_availability")
-            return check_username_availability(event, cors_headers)
-        elif http_method == 'GET' and path == '/users/me':
-            log_debug("Routing to get_current_user_profile")
-            return get_current_user_profile(event, cors_headers)
-        elif http_method == 'POST' and path == '/profiles':
-            log_debug("Routing to create_or_update_profile")
-            return create_or_update_profile(event, cors_headers)
-        elif http_method == 'GET' and path.startswith('/profiles/'):
+
+        route = _ROUTES.get((http_method, path)) or _match_dynamic(http_method, path)
+        if route is get_public_profile:
             username = path.split('/')[-1]
             log_debug(f"Routing to get_public_profile for username: {username}")
             # Pass event to check if requester is the owner
             return get_public_profile(username, cors_headers, event)
+        elif route is not None:
+            log_debug(f"Routing to {route.__name__}")
+            return route(event, cors_headers)
         else:
             log_debug(f"Method not allowed - method: {http_method}, path: {path}")
             return {
                 'statusCode': 405,
                 'headers': cors_headers,
-                'body': json.dumps({'error': 'Method not allowed'})
+                'body': _ERR_METHOD_NOT_ALLOWED
             }
     except Exception as e:
         log_error("Error in handler", e, include_traceback=IS_DEBUG)
-        cors_headers_final = cors_headers if 'cors_headers' in locals() else get_cors_headers()
-        
+
         return {
             'statusCode': 500,
-            'headers': cors_headers_final,
-            'body': json.dumps({
+            'headers': cors_headers,
+            'body': _dumps({
                 'error': 'Internal server error',
                 'message': 'An error occurred processing your request'
             })
         }
 
+# Scalar profile attributes copied verbatim from the request body / stored
+# item. Merging through this whitelist keeps stale derived attributes (old
+# presigned URLs etc.) on legacy records from being re-persisted.
+_PROFILE_FIELDS = ('full_name', 'title', 'bio', 'email', 'phone',
+                   'show_email', 'show_phone', 'show_resume', 'show_avatar',
+                   'favorite_color', 'date_of_birth')
+_PROFILE_DEFAULTS = {
+    'full_name': '', 'title': '', 'bio': '', 'email': '', 'phone': '',
+    'show_email': False, 'show_phone': False, 'show_resume': False,
+    # Avatars are public by default; legacy items without the flag keep showing
+    'show_avatar': True,
+    'favorite_color': ''
+}
+
+# date_of_birth and favorite_color are excluded from the verbatim body merge:
+# a falsy DOB or a null favorite_color from the client must preserve the
+# stored value, so they're gated explicitly in create_or_update_profile
+_VERBATIM_FIELDS = tuple(f for f in _PROFILE_FIELDS
+                         if f not in ('date_of_birth', 'favorite_color'))
+
+def _prefer(body_val, existing_val, empty):
+    """Pick the request value if it's a non-empty dict/list (matching the type
+    of `empty`), else the existing stored value, else the empty default"""
+    if isinstance(body_val, type(empty)) and body_val:
+        return body_val
+    if isinstance(existing_val, type(empty)) and existing_val:
+        return existing_val
+    return empty
+
 def create_or_update_profile(event, cors_headers=None):
     """POST /profiles - Create or update profile"""
     log_info("create_or_update_profile called")
@@ -319,94 +600,96 @@ def create_or_update_profile(event, cors_headers=None):
         return {
             'statusCode': 401,
             'headers': cors_headers,
-            'body': json.dumps({'error': 'Unauthorized', 'message': 'No user_id found in JWT claims'})
+            'body': _ERR_UNAUTHORIZED
         }
     
     log_info(f"Processing profile creation/update for user_id: {user_id}")
     
     try:
-        body = json.loads(event.get('body', '{}'))
-    except json.JSONDecodeError as e:
+        # API Gateway can send body=None for empty POSTs; decode base64 payloads if flagged
+        raw_body = event.get('body') or ''
+        if raw_body and event.get('isBase64Encoded'):
+            raw_body = base64.b64decode(raw_body).decode('utf-8')
+        body = _loads(raw_body) if raw_body else {}
+    except (json.JSONDecodeError, ValueError) as e:
         log_error("Invalid JSON in request body", e)
         return {
             'statusCode': 400,
             'headers': cors_headers,
-            'body': json.dumps({'error': 'Invalid JSON', 'message': 'Request body must be valid JSON'})
+            'body': _ERR_INVALID_JSON
         }
     
-    log_debug(f"Request body keys: {list(body.keys())}")
+    log_debug(f"Request body keys: {','.join(body)}")
     
+    # Single timestamp per invocation - reused for every created_at/updated_at below
+    now = datetime.utcnow().isoformat()
+
     # Validate required fields
     username = body.get('username')
     if not username:
         return {
             'statusCode': 400,
-            'headers': cors_headers if cors_headers else get_cors_headers(),
-            'body': json.dumps({'error': 'username is required'})
+            'headers': cors_headers,
+            'body': _ERR_USERNAME_REQUIRED
         }
     
-    # Check if username is already taken by another user
+    # One read covers both the username-conflict check and the existing-profile
+    # merge below; the user record is upserted without a read further down
     try:
-        existing = profiles_table.get_item(Key={'username': username})
-        if 'Item' in existing and existing['Item'].get('user_id') != user_id:
-            return {
-                'statusCode': 409,
-                'headers': cors_headers if cors_headers else get_cors_headers(),
-                'body': json.dumps({'error': 'Username already taken'})
-            }
+        response = ddb.get_item(
+            TableName=PROFILES_TABLE_NAME,
+            Key={'username': {'S': username}}
+        )
+        raw_item = response.get('Item')
+        existing_profile_item = _from_ddb(raw_item) if raw_item else None
     except ClientError as e:
         # Log detailed error for debugging
-        log_error("Database error checking username availability", e, include_traceback=IS_DEBUG)
-        
+        log_error("Database error reading profile and user records", e, include_traceback=IS_DEBUG)
+
         # Return generic error to user
         return {
             'statusCode': 500,
-            'headers': cors_headers if cors_headers else get_cors_headers(),
-            'body': json.dumps({'error': 'Internal server error', 'message': 'An error occurred processing your request'})
+            'headers': cors_headers,
+            'body': _ERR_INTERNAL
         }
-    
-    # Get or update user record
+
+    if existing_profile_item is not None and existing_profile_item.get('user_id') != user_id:
+        return {
+            'statusCode': 409,
+            'headers': cors_headers,
+            'body': _ERR_USERNAME_TAKEN
+        }
+
+    # Upsert the user record in one UpdateItem: if_not_exists preserves
+    # email/created_at on existing records while a single call handles both the
+    # create and update paths, saving the get_item round trip per POST
     try:
-        user = users_table.get_item(Key={'user_id': user_id})
         # Get claims from authorizer (HTTP API v2 format: authorizer.claims)
         authorizer = event.get('requestContext', {}).get('authorizer', {})
         claims = authorizer.get('claims', {}) or authorizer.get('jwt', {}).get('claims', {})
-        now = datetime.utcnow().isoformat()
-        
-        if 'Item' not in user:
-            # Create user record
-            user_item = {
-                'user_id': user_id,
-                'email': claims.get('email', ''),
-                'username': username,
-                'created_at': now,
-                'updated_at': now,
-                'profile_complete': True
-            }
-            # Add date_of_birth if provided
-            date_of_birth = body.get('date_of_birth')
-            if date_of_birth:
-                user_item['date_of_birth'] = date_of_birth
-            users_table.put_item(Item=user_item)
-        else:
-            # Update existing user record with username and date_of_birth if provided
-            update_expression = "SET username = :u, updated_at = :up, profile_complete = :pc"
-            expression_attribute_values = {
-                ':u': username,
-                ':up': now,
-                ':pc': True
-            }
-            
-            date_of_birth = body.get('date_of_birth')
-            if date_of_birth:
-                update_expression += ", date_of_birth = :dob"
-                expression_attribute_values[':dob'] = date_of_birth
-            
-            users_table.update_item(
-                Key={'user_id': user_id},
-                UpdateExpression=update_expression,
-                ExpressionAttributeValues=expression_attribute_values
-            )
+
+        update_expression = ("SET username = :u, updated_at = :up, profile_complete = :pc, "
+                             "email = if_not_exists(email, :e), "
+                             "created_at = if_not_exists(created_at, :now)")
+        expression_attribute_values = {
+            ':u': {'S': username},
+            ':up': {'S': now},
+            ':pc': {'BOOL': True},
+            ':e': {'S': claims.get('email', '')},
+            ':now': {'S': now}
+        }
+
+        date_of_birth = body.get('date_of_birth')
+        if date_of_birth:
+            update_expression += ", date_of_birth = :dob"
+            expression_attribute_values[':dob'] = {'S': date_of_birth}
+
+        ddb.update_item(
+            TableName=USERS_TABLE_NAME,
+            Key={'user_id': {'S': user_id}},
+            UpdateExpression=update_expression,
+            ExpressionAttributeValues=expression_attribute_values
+        )
     except ClientError as e:
         # Log detailed error for debugging
         log_error("Database error updating user record", e, include_traceback=IS_DEBUG)
@@ -414,13 +697,12 @@ def create_or_update_profile(event, cors_headers=None):
         # Return generic error to user
         return {
             'statusCode': 500,
-            'headers': cors_headers if cors_headers else get_cors_headers(),
-            'body': json.dumps({'error': 'Internal server error', 'message': 'An error occurred processing your request'})
+            'headers': cors_headers,
+            'body': _ERR_INTERNAL
         }
     
-    # Check if profile exists first to preserve existing fields
-    existing_profile = profiles_table.get_item(Key={'username': username})
-    existing_item = existing_profile.get('Item', {}) if 'Item' in existing_profile else {}
+    # Existing profile (from the batch read above) is used to preserve fields
+    existing_item = existing_profile_item if existing_profile_item is not None else {}
     
     # Prepare profile item
     # Extract avatar_key from profile_image_url if it's an S3 URL
@@ -434,196 +716,107 @@ def create_or_update_profile(event, cors_headers=None):
         avatar_key = existing_item.get('avatar_key', '')
     
     # If profile_image_url is an S3 URL, extract the key
-    if profile_image_url and 's3.amazonaws.com' in profile_image_url and not avatar_key:
+    if profile_image_url and not avatar_key:
         # Extract key from URL: https://bucket.s3.amazonaws.com/users/xxx/profile/file.jpg
-        try:
-            parts = profile_image_url.split('.s3.amazonaws.com/')
-            if len(parts) > 1:
-                avatar_key = parts[1]
-        except:
-            pass
-    
-    # Build profile item, preserving existing values if not provided in body
-    # For social_links, only update if provided and not empty
-    social_links_from_body = body.get('social_links')
-    existing_social_links = existing_item.get('social_links', {})
-    
-    print(f"DEBUG: social_links from body: {social_links_from_body}, type: {type(social_links_from_body)}")
-    print(f"DEBUG: existing social_links: {existing_social_links}, type: {type(existing_social_links)}")
+        avatar_key = _s3_key_from_url(profile_image_url) or avatar_key
     
-    # Only use body value if it's a non-empty dict
-    if (social_links_from_body is not None and 
-        isinstance(social_links_from_body, dict) and 
-        len(social_links_from_body) > 0):
-        social_links = social_links_from_body
-        print(f"DEBUG: Using social_links from body: {social_links}")
-    else:
-        # Preserve existing, but ensure it's a dict
-        if isinstance(existing_social_links, dict) and len(existing_social_links) > 0:
-            social_links = existing_social_links
-            print(f"DEBUG: Preserving existing social_links: {social_links}")
-        else:
-            # If existing is also empty/invalid, use empty dict
-            social_links = {}
-            print(f"DEBUG: No valid social_links found, using empty dict")
-    
-    # For skills, only update if provided and not empty list
+    # Build profile item, preserving existing values if not provided in body.
+    # One _prefer call per field replaces the per-field isinstance/len ladders.
+    social_links = _prefer(body.get('social_links'), existing_item.get('social_links'), {})
+    projects = _prefer(body.get('projects'), existing_item.get('projects'), [])
+
+    # Any list from the client wins for skills - including [] so deleting the
+    # last skill actually clears it; _prefer only arbitrates when the body
+    # omits the field entirely
     skills_from_body = body.get('skills')
-    if skills_from_body is not None and isinstance(skills_from_body, list):
+    if isinstance(skills_from_body, list):
         skills = skills_from_body
     else:
-        skills = existing_item.get('skills', [])
-    
-    # For projects, only update if provided and not empty list
-    projects_from_body = body.get('projects')
-    existing_projects = existing_item.get('projects', [])
-    
-    print(f"DEBUG: projects from body: {projects_from_body}, type: {type(projects_from_body)}")
-    print(f"DEBUG: existing projects: {existing_projects}, type: {type(existing_projects)}")
-    
-    # Only use body value if it's a non-empty list
-    if (projects_from_body is not None and 
-        isinstance(projects_from_body, list) and 
-        len(projects_from_body) > 0):
-        projects = projects_from_body
-        print(f"DEBUG: Using projects from body: {len(projects)} projects")
-        # Debug: Check if tech_stack is present in projects
-        for idx, project in enumerate(projects):
-            if isinstance(project, dict):
-                tech_stack = project.get('tech_stack')
-                print(f"DEBUG: Project {idx} tech_stack: {tech_stack}, type: {type(tech_stack)}")
-    else:
-        # Preserve existing, but ensure it's a list
-        if isinstance(existing_projects, list) and len(existing_projects) > 0:
-            projects = existing_projects
-            print(f"DEBUG: Preserving existing projects: {len(projects)} projects")
-            # Debug: Check if tech_stack is present in existing projects
-            for idx, project in enumerate(projects):
-                if isinstance(project, dict):
-                    tech_stack = project.get('tech_stack')
-                    print(f"DEBUG: Existing project {idx} tech_stack: {tech_stack}, type: {type(tech_stack)}")
-        else:
-            # If existing is also empty/invalid, use empty list
-            projects = []
-            print(f"DEBUG: No valid projects found, using empty list")
-    
+        skills = _prefer(None, existing_item.get('skills'), [])
+
+    # Scalar fields resolve through two C-level dict merges (defaults, then
+    # stored values, then whitelisted request values) instead of a per-field
+    # "if x in body else existing" conditional ladder
     profile_item = {
+        **_PROFILE_DEFAULTS,
+        **{k: existing_item[k] for k in _PROFILE_FIELDS if k in existing_item},
+        **{k: body[k] for k in _VERBATIM_FIELDS if k in body},
         'username': username,
         'user_id': user_id,
-        'full_name': body.get('full_name') or body.get('displayName') or existing_item.get('full_name', ''),
-        'title': body.get('title') if 'title' in body else existing_item.get('title', ''),
-        'bio': body.get('bio') if 'bio' in body else existing_item.get('bio', ''),
         'skills': skills,
         'social_links': social_links,
         'projects': projects,
-        # Store both key (internal reference) and URL (public access)
+        # Only the key is stored; presigned URLs are generated on read
         'avatar_key': avatar_key,
-        'avatar_url': profile_image_url,
-        # Keep profile_image_url for backward compatibility
-        'profile_image_url': profile_image_url,
-        'email': body.get('email') if 'email' in body else existing_item.get('email', ''),
-        'phone': body.get('phone') if 'phone' in body else existing_item.get('phone', ''),
-        'show_email': body.get('show_email') if 'show_email' in body else existing_item.get('show_email', False),
-        'show_phone': body.get('show_phone') if 'show_phone' in body else existing_item.get('show_phone', False),
-        'show_resume': body.get('show_resume') if 'show_resume' in body else existing_item.get('show_resume', False),
-        'updated_at': datetime.utcnow().isoformat()
+        'updated_at': now,
+        'created_at': existing_item.get('created_at', now)
     }
-    
-    # Handle favorite_color - always set it if provided, otherwise preserve existing
-    favorite_color_from_body = body.get('favorite_color')
-    if favorite_color_from_body is not None:
-        profile_item['favorite_color'] = favorite_color_from_body
-        print(f"DEBUG: Setting favorite_color from body: {favorite_color_from_body}")
-    elif 'favorite_color' in existing_item:
-        profile_item['favorite_color'] = existing_item.get('favorite_color', '')
-        print(f"DEBUG: Preserving existing favorite_color: {existing_item.get('favorite_color', '')}")
-    else:
-        # If not in body and not in existing, set to empty string (or default)
-        profile_item['favorite_color'] = ''
-        print(f"DEBUG: No favorite_color found, setting to empty string")
-    
-    # Handle resume_key and resume_url - generate URL from key if not provided
-    resume_key_from_body = body.get('resume_key')
-    resume_url_from_body = body.get('resume_url')
-    
-    # Determine which resume_key to use (from body or existing)
-    resume_key_to_use = resume_key_from_body if resume_key_from_body else existing_item.get('resume_key', '')
-    if resume_key_to_use:
-        profile_item['resume_key'] = resume_key_to_use
-    
-    # Set resume_url: ALWAYS generate from key if key exists, unless a valid URL is explicitly provided
-    if resume_url_from_body and resume_url_from_body.strip():
-        # Use provided URL if it's non-empty and valid
-        profile_item['resume_url'] = resume_url_from_body
-        print(f"DEBUG: Using provided resume_url: {resume_url_from_body}")
-    elif resume_key_to_use:
-        # CRITICAL: Always generate URL from key if we have a key
-        generated_url = _get_resume_url_from_key(resume_key_to_use)
-        if generated_url:
-            profile_item['resume_url'] = generated_url
-            print(f"DEBUG: Generated resume_url from key: {generated_url}")
-        else:
-            # Fallback: construct URL manually if S3_BUCKET not set
-            bucket_name = os.environ.get('S3_BUCKET', '')
-            if bucket_name:
-                fallback_url = f"https://{bucket_name}.s3.amazonaws.com/{resume_key_to_use}"
-                profile_item['resume_url'] = fallback_url
-                print(f"DEBUG: Generated fallback resume_url: {fallback_url}")
-            else:
-                print(f"ERROR: Cannot generate resume_url - S3_BUCKET not set and key exists: {resume_key_to_use}")
-                # Still try to keep existing URL if available
-                if 'resume_url' in existing_item:
-                    profile_item['resume_url'] = existing_item.get('resume_url', '')
-    elif 'resume_url' in existing_item:
-        # Keep existing resume_url if no key
-        profile_item['resume_url'] = existing_item.get('resume_url', '')
-    
-    # Add date_of_birth if provided (for social logins completing profile)
-    date_of_birth = body.get('date_of_birth')
+
+    # Gated updates (see _VERBATIM_FIELDS): a null/empty date_of_birth or a
+    # null favorite_color keeps the stored value, matching the users-table
+    # update above
     if date_of_birth:
         profile_item['date_of_birth'] = date_of_birth
-    elif 'date_of_birth' in existing_item:
-        profile_item['date_of_birth'] = existing_item['date_of_birth']
-    
-    if 'Item' not in existing_profile:
-        profile_item['created_at'] = datetime.utcnow().isoformat()
-        print(f"Creating new profile record for username: {username}")
+    favorite_color = body.get('favorite_color')
+    if favorite_color is not None:
+        profile_item['favorite_color'] = favorite_color
+
+    # displayName is the frontend alias for full_name
+    if not profile_item['full_name']:
+        profile_item['full_name'] = body.get('displayName') or existing_item.get('full_name', '')
+
+    # Handle resume - only the S3 key is persisted; URLs are presigned on read
+    resume_key_to_use = body.get('resume_key') or existing_item.get('resume_key', '')
+    if resume_key_to_use:
+        profile_item['resume_key'] = resume_key_to_use
+
+    if existing_profile_item is None:
+        log_info(f"Creating new profile record for username: {username}")
     else:
-        # Preserve created_at from existing profile
-        profile_item['created_at'] = existing_item.get('created_at', datetime.utcnow().isoformat())
-        print(f"Updating existing profile record for username: {username}")
-        print(f"DEBUG: Preserving existing fields, social_links from body: {body.get('social_links')}")
-        print(f"DEBUG: Final social_links in profile_item: {profile_item.get('social_links')}")
-    
-    # Debug: Log resume fields and favorite_color before saving
-    print(f"DEBUG: Saving profile with resume_key: {profile_item.get('resume_key', 'NOT SET')}")
-    print(f"DEBUG: Saving profile with resume_url: {profile_item.get('resume_url', 'NOT SET')}")
-    print(f"DEBUG: Saving profile with favorite_color: {profile_item.get('favorite_color', 'NOT SET')}")
-    print(f"DEBUG: S3_BUCKET env var available: {bool(os.environ.get('S3_BUCKET', ''))}")
-    
-    # Debug: Log projects with tech_stack before saving
-    print(f"DEBUG: Saving profile with {len(profile_item.get('projects', []))} projects")
-    for idx, project in enumerate(profile_item.get('projects', [])):
-        if isinstance(project, dict):
-            print(f"DEBUG: Project {idx} being saved: title={project.get('title')}, tech_stack={project.get('tech_stack')}, all_keys={list(project.keys())}")
-    
+        log_info(f"Updating existing profile record for username: {username}")
+
+    log_debug(f"Saving profile with resume_key: {profile_item.get('resume_key', 'NOT SET')}, "
+              f"{len(profile_item.get('projects', []))} projects")
+
     try:
-        profiles_table.put_item(Item=profile_item)
-        print(f"✓ Successfully saved profile record for username: {username}")
+        # DynamoDB enforces uniqueness atomically - the read above is only a
+        # fast path, so a concurrent claim of the same username still gets a 409
+        ddb.put_item(
+            TableName=PROFILES_TABLE_NAME,
+            Item=_to_ddb(profile_item),
+            ConditionExpression='attribute_not_exists(username) OR user_id = :uid',
+            ExpressionAttributeValues={':uid': {'S': user_id}}
+        )
+        log_info(f"Saved profile record for username: {username}")
+        # The name is now taken - reflect that in the availability cache,
+        # and drop any cached copy of the old profile
+        _username_check_put(username, False)
+        _profile_cache_invalidate(username)
         return {
             'statusCode': 200,
-            'headers': cors_headers if cors_headers else get_cors_headers(),
-            'body': json.dumps({'message': 'Profile saved successfully', 'profile': profile_item})
+            'headers': cors_headers,
+            # The requester on POST /profiles is always the owner, and owners
+            # get their resume URL regardless of show_resume (as on the read
+            # path), so always hydrate it here
+            'body': _dumps({'message': 'Profile saved successfully',
+                            'profile': _hydrate_profile(profile_item, include_resume=True)})
         }
     except ClientError as e:
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            return {
+                'statusCode': 409,
+                'headers': cors_headers,
+                'body': _ERR_USERNAME_TAKEN
+            }
+
         # Log detailed error for debugging
         log_error("Database error saving profile record", e, include_traceback=IS_DEBUG)
         
         # Return generic error to user
         return {
             'statusCode': 500,
-            'headers': cors_headers if cors_headers else get_cors_headers(),
-            'body': json.dumps({'error': 'Internal server error', 'message': 'An error occurred saving your profile'})
+            'headers': cors_headers,
+            'body': _ERR_SAVE_PROFILE
         }
 
 def get_current_user_profile(event, cors_headers=None):
@@ -643,27 +836,32 @@ def get_current_user_profile(event, cors_headers=None):
         return {
             'statusCode': 401,
             'headers': cors_headers,
-            'body': json.dumps({'error': 'Unauthorized', 'message': 'No user_id found in JWT claims'})
+            'body': _ERR_UNAUTHORIZED
         }
     
     try:
         print(f"DEBUG: Querying users table for user_id: {user_id}")
-        user = users_table.get_item(Key={'user_id': user_id})
-        
+        # Only fetch the attributes the response actually returns
+        user = ddb.get_item(
+            TableName=USERS_TABLE_NAME,
+            Key={'user_id': {'S': user_id}},
+            ProjectionExpression='user_id, username, email, profile_complete, date_of_birth, fullname'
+        )
+
         if 'Item' not in user:
             print(f"DEBUG: User not found in users table for user_id: {user_id}")
             return {
                 'statusCode': 404,
                 'headers': cors_headers,
-                'body': json.dumps({
+                'body': _dumps({
                     'error': 'User not found',
                     'profile_complete': False,
                     'username': None
                 })
             }
         
-        user_item = user['Item']
-        print(f"DEBUG: User found: {json.dumps(user_item, default=str)}")
+        user_item = _from_ddb(user['Item'])
+        print(f"DEBUG: User found: {_dumps(user_item)}")
         
         result = {
             'user_id': user_item.get('user_id'),
@@ -674,7 +872,7 @@ def get_current_user_profile(event, cors_headers=None):
             'fullname': user_item.get('fullname')
         }
         
-        print(f"DEBUG: Returning user profile: {json.dumps(result, default=str)}")
+        print(f"DEBUG: Returning user profile: {_dumps(result)}")
         print("=" * 80)
         print("get_current_user_profile COMPLETED SUCCESSFULLY")
         print("=" * 80)
@@ -682,7 +880,7 @@ def get_current_user_profile(event, cors_headers=None):
         return {
             'statusCode': 200,
             'headers': cors_headers,
-            'body': json.dumps(result)
+            'body': _dumps(result)
         }
     except ClientError as e:
         # Log detailed error for debugging
@@ -692,16 +890,14 @@ def get_current_user_profile(event, cors_headers=None):
         return {
             'statusCode': 500,
             'headers': cors_headers,
-            'body': json.dumps({'error': 'Internal server error', 'message': 'An error occurred retrieving your profile'})
+            'body': _ERR_GET_OWN_PROFILE
         }
     except Exception as e:
-        print(f"ERROR: Unexpected error: {str(e)}")
-        import traceback
-        print(f"Traceback: {traceback.format_exc()}")
+        log_error("Unexpected error", e, include_traceback=True)
         return {
             'statusCode': 500,
             'headers': cors_headers,
-            'body': json.dumps({'error': f'Internal server error: {str(e)}'})
+            'body': _dumps({'error': f'Internal server error: {str(e)}'})
         }
 
 def get_public_profile(username, cors_headers=None, event=None):
@@ -710,15 +906,21 @@ def get_public_profile(username, cors_headers=None, event=None):
         cors_headers = get_cors_headers()
     
     try:
-        response = profiles_table.get_item(Key={'username': username})
-        if 'Item' not in response:
-            return {
-                'statusCode': 404,
-                'headers': cors_headers,
-                'body': json.dumps({'error': 'Profile not found'})
-            }
-        
-        profile = response['Item']
+        profile = _profile_cache_get(username)
+        if profile is None:
+            response = ddb.get_item(
+                TableName=PROFILES_TABLE_NAME,
+                Key={'username': {'S': username}}
+            )
+            if 'Item' not in response:
+                return {
+                    'statusCode': 404,
+                    'headers': cors_headers,
+                    'body': _ERR_PROFILE_NOT_FOUND
+                }
+
+            profile = _from_ddb(response['Item'])
+            _profile_cache_put(username, dict(profile))
         
         # Check if requester is the profile owner
         is_owner = False
@@ -731,63 +933,59 @@ def get_public_profile(username, cors_headers=None, event=None):
         # Get user's links (if LINKS_TABLE is configured)
         links = []
         try:
-            links_table_name = os.environ.get('LINKS_TABLE', '')
-            if links_table_name:
-                links_table = dynamodb.Table(links_table_name)
-                links_response = links_table.query(
-                    KeyConditionExpression=Key('user_id').eq(profile['user_id']),
+            if LINKS_TABLE_NAME:
+                # Project only the attributes the response uses (url and order
+                # are reserved words, hence the name aliases). Sorting stays in
+                # Python - ordering by sort key would need a schema change.
+                links_response = ddb.query(
+                    TableName=LINKS_TABLE_NAME,
+                    KeyConditionExpression='user_id = :uid',
                     FilterExpression='is_deleted = :false',
-                    ExpressionAttributeValues={':false': False}
+                    ProjectionExpression='title, #u, #o',
+                    ExpressionAttributeNames={'#u': 'url', '#o': 'order'},
+                    ExpressionAttributeValues={
+                        ':uid': {'S': profile['user_id']},
+                        ':false': {'BOOL': False}
+                    }
                 )
-                links = sorted(links_response.get('Items', []), key=lambda x: x.get('order', 0))
+                links = sorted((_from_ddb(l) for l in links_response.get('Items', [])),
+                               key=lambda x: x.get('order', 0))
         except Exception as links_error:
             # If links table doesn't exist or query fails, just continue without links
             print(f"WARNING: Could not fetch links: {str(links_error)}")
             links = []
         
-        # Build public profile response
-        # Prefer avatar_url, fallback to profile_image_url for backward compatibility
-        avatar_url = profile.get('avatar_url') or profile.get('profile_image_url', '')
-        avatar_key = profile.get('avatar_key')
-        
-        # If avatar_url is a direct S3 URL (not presigned), generate presigned URL from key
-        if avatar_url and 's3.amazonaws.com' in avatar_url and 'X-Amz-Signature' not in avatar_url:
-            if avatar_key:
-                presigned_avatar_url = _get_avatar_url_from_key(avatar_key)
-                if presigned_avatar_url:
-                    avatar_url = presigned_avatar_url
-        # If no avatar_url but we have avatar_key, generate presigned URL
-        elif not avatar_url and avatar_key:
-            avatar_url = _get_avatar_url_from_key(avatar_key) or ''
-        
-        # Get social_links from profile, ensure it's a dict
-        social_links = profile.get('social_links', {})
-        if not isinstance(social_links, dict):
-            print(f"WARNING: social_links is not a dict, type: {type(social_links)}, value: {social_links}")
-            social_links = {}
-        
-        print(f"DEBUG: Returning social_links: {social_links}, type: {type(social_links)}, keys: {list(social_links.keys()) if isinstance(social_links, dict) else 'N/A'}")
-        
-        # Get projects from profile, ensure it's a list
-        projects = profile.get('projects', [])
-        if not isinstance(projects, list):
-            print(f"WARNING: projects is not a list, type: {type(projects)}, value: {projects}")
-            projects = []
-        
-        print(f"DEBUG: Returning projects: {len(projects)} projects, type: {type(projects)}")
-        # Debug: Check if tech_stack is present in projects being returned
-        for idx, project in enumerate(projects):
-            if isinstance(project, dict):
-                tech_stack = project.get('tech_stack')
-                print(f"DEBUG: Returning project {idx} tech_stack: {tech_stack}, type: {type(tech_stack)}")
-                print(f"DEBUG: Returning project {idx} keys: {list(project.keys())}")
-        
+        # Build public profile response - presigned URLs are derived from the
+        # stored keys (with legacy stored-URL fallback). Skip the signing work
+        # entirely for assets the requester isn't allowed to see: a hidden
+        # resume (the common case) and a hidden avatar each save one SigV4 pass.
+        profile = _hydrate_profile(
+            profile,
+            include_resume=bool(profile.get('show_resume')) or is_owner,
+            include_avatar=is_owner or bool(profile.get('show_avatar', True))
+        )
+        avatar_url = profile['avatar_url']
+
+        # Bind the bound method once - the dict build below does ~15 lookups
+        # and each profile.get costs an attribute resolution in CPython
+        pg = profile.get
+
+        # The write path (_prefer) guarantees social_links is a dict and
+        # projects is a list, so the read path passes them through untyped-
+        # checked rather than re-validating per request
+        social_links = pg('social_links', {})
+        projects = pg('projects', [])
+        show_resume = pg('show_resume', False)
+        resume_key = pg('resume_key')
+
+        log_debug(f"Returning {len(projects)} projects, {len(social_links)} social links")
+
         public_profile = {
             'username': profile['username'],
-            'full_name': profile.get('full_name', ''),
-            'title': profile.get('title', ''),
-            'bio': profile.get('bio', ''),
-            'skills': profile.get('skills', []),
+            'full_name': pg('full_name', ''),
+            'title': pg('title', ''),
+            'bio': pg('bio', ''),
+            'skills': pg('skills', []),
             'social_links': social_links,
             'projects': projects,
             'profile_image_url': avatar_url,  # Use avatar_url if available
@@ -795,71 +993,43 @@ def get_public_profile(username, cors_headers=None, event=None):
             'links': [{'title': l.get('title'), 'url': l.get('url')} for l in links],
             # Resume URL - always include if present
             # If resume_url doesn't exist but resume_key does, generate the URL from key
-            'resume_url': _get_resume_url(profile),
+            'resume_url': profile['resume_url'],
             # Always include visibility flags
-            'show_email': profile.get('show_email', False),
-            'show_phone': profile.get('show_phone', False),
-            'show_resume': profile.get('show_resume', False),
-            'favorite_color': profile.get('favorite_color') or ''
+            'show_email': pg('show_email', False),
+            'show_phone': pg('show_phone', False),
+            'show_resume': show_resume,
+            'show_avatar': pg('show_avatar', True),
+            'favorite_color': pg('favorite_color') or ''
         }
-        
+
         # Add contact info - always include for owner, conditionally for public
+        email = pg('email')
+        phone = pg('phone')
         if is_owner:
             # Owner always sees their own contact info
-            if profile.get('email'):
-                public_profile['email'] = profile.get('email', '')
-            if profile.get('phone'):
-                public_profile['phone'] = profile.get('phone', '')
+            if email:
+                public_profile['email'] = email
+            if phone:
+                public_profile['phone'] = phone
         else:
             # Public view - only if visibility flags are enabled
-            if profile.get('show_email'):
-                public_profile['email'] = profile.get('email', '')
-            if profile.get('show_phone'):
-                public_profile['phone'] = profile.get('phone', '')
-        
-        if profile.get('show_resume') and profile.get('resume_key'):
-            public_profile['resume_key'] = profile.get('resume_key')
-        
-        # Debug: Log resume_url
-        print(f"DEBUG: Profile resume_url: {profile.get('resume_url')}, resumeUrl: {profile.get('resumeUrl')}, resume_key: {profile.get('resume_key')}")
-        generated_resume_url = _get_resume_url(profile)
-        print(f"DEBUG: Generated resume_url: {generated_resume_url}")
-        print(f"DEBUG: Public profile resume_url: {public_profile.get('resume_url')}")
-        print(f"DEBUG: Full public_profile keys: {list(public_profile.keys())}")
-        print(f"DEBUG: Full public_profile resume data: {json.dumps({k: v for k, v in public_profile.items() if 'resume' in k.lower()})}")
-        print(f"DEBUG: S3_BUCKET env var: {os.environ.get('S3_BUCKET', 'NOT SET')}")
-        
-        # Ensure all data is JSON serializable
-        try:
-            # Test serialization before returning
-            json.dumps(public_profile, default=str)
-            print(f"DEBUG: Successfully serialized public_profile")
-        except Exception as json_error:
-            print(f"ERROR: Failed to serialize public_profile: {str(json_error)}")
-            print(f"DEBUG: public_profile keys: {list(public_profile.keys())}")
-            print(f"DEBUG: projects type: {type(public_profile.get('projects'))}")
-            import traceback
-            print(f"Traceback: {traceback.format_exc()}")
-            # Try to fix projects if it's the issue
-            if 'projects' in public_profile:
-                try:
-                    # Ensure projects is a list of serializable dicts
-                    projects_list = public_profile['projects']
-                    if isinstance(projects_list, list):
-                        # Convert any non-serializable items
-                        public_profile['projects'] = [
-                            {k: str(v) if not isinstance(v, (str, int, float, bool, type(None))) else v 
-                             for k, v in (p.items() if isinstance(p, dict) else {})} 
-                            for p in projects_list
-                        ]
-                except Exception as fix_error:
-                    print(f"ERROR: Failed to fix projects: {str(fix_error)}")
-                    public_profile['projects'] = []
-        
+            if pg('show_email'):
+                public_profile['email'] = email or ''
+            if pg('show_phone'):
+                public_profile['phone'] = phone or ''
+
+        if show_resume and resume_key:
+            public_profile['resume_key'] = resume_key
+
+        log_debug(f"Public profile resume_key set: {bool(resume_key)}, "
+                  f"resume_url set: {bool(public_profile.get('resume_url'))}")
+
+        # _dumps falls back to str for anything non-JSON-native (Decimal etc.),
+        # so the body serializes exactly once at return
         return {
             'statusCode': 200,
             'headers': cors_headers,
-            'body': json.dumps(public_profile, default=str)
+            'body': _dumps(public_profile)
         }
     except ClientError as e:
         # Log detailed error for debugging
@@ -869,16 +1039,14 @@ def get_public_profile(username, cors_headers=None, event=None):
         return {
             'statusCode': 500,
             'headers': cors_headers,
-            'body': json.dumps({'error': 'Internal server error', 'message': 'An error occurred retrieving the profile'})
+            'body': _ERR_GET_PROFILE
         }
     except Exception as e:
-        import traceback
-        print(f"ERROR: Unexpected error in get_public_profile: {str(e)}")
-        print(f"Traceback: {traceback.format_exc()}")
+        log_error("Unexpected error in get_public_profile", e, include_traceback=True)
         return {
             'statusCode': 500,
             'headers': cors_headers,
-            'body': json.dumps({'error': 'Internal server error', 'message': str(e)})
+            'body': _dumps({'error': 'Internal server error', 'message': str(e)})
         }
 
 def check_username_availability(event, cors_headers=None):
@@ -889,7 +1057,7 @@ def check_username_availability(event, cors_headers=None):
     print("=" * 80)
     print("check_username_availability CALLED")
     print("=" * 80)
-    print(f"Event: {json.dumps(event, default=str)}")
+    print(f"Event: {_dumps(event)}")
     try:
         # Handle both API Gateway v1 and v2 event formats
         query_params = event.get('queryStringParameters') or {}
@@ -910,38 +1078,48 @@ def check_username_availability(event, cors_headers=None):
         if not username:
             return {
                 'statusCode': 400,
-                'headers': cors_headers if cors_headers else get_cors_headers(),
-                'body': json.dumps({'error': 'Username parameter is required'})
+                'headers': cors_headers,
+                'body': _ERR_USERNAME_PARAM_REQUIRED
             }
         
         # Validate username format (alphanumeric, underscore, hyphen, 3-20 chars)
-        import re
-        if not re.match(r'^[a-z0-9_-]{3,20}$', username):
+        if not _USERNAME_RE.match(username):
             return {
                 'statusCode': 400,
-                'headers': cors_headers if cors_headers else get_cors_headers(),
-                'body': json.dumps({
+                'headers': cors_headers,
+                'body': _dumps({
                     'available': False,
                     'error': 'Username must be 3-20 characters and contain only letters, numbers, underscores, and hyphens'
                 })
             }
         
         try:
-            # Check if username exists in profiles table
-            print(f"DEBUG: Checking DynamoDB for username: {username}")
-            response = profiles_table.get_item(Key={'username': username})
-            available = 'Item' not in response
+            # Serve recent answers from the container-local cache before
+            # touching DynamoDB
+            cached = _USERNAME_CHECK_CACHE.get(username)
+            if cached and cached[1] > time.time():
+                available = cached[0]
+            else:
+                print(f"DEBUG: Checking DynamoDB for username: {username}")
+                response = ddb.get_item(
+                    TableName=PROFILES_TABLE_NAME,
+                    Key={'username': {'S': username}},
+                    # Only existence matters - project a single attribute
+                    ProjectionExpression='username'
+                )
+                available = 'Item' not in response
+                _username_check_put(username, available)
             print(f"DEBUG: Username availability check - available: {available}")
             
             result = {
                 'statusCode': 200,
-                'headers': cors_headers if cors_headers else get_cors_headers(),
-                'body': json.dumps({
+                'headers': cors_headers,
+                'body': _dumps({
                     'available': available,
                     'username': username
                 })
             }
-            print(f"DEBUG: Returning result: {json.dumps(result, default=str)}")
+            print(f"DEBUG: Returning result: {_dumps(result)}")
             print("=" * 80)
             print("check_username_availability COMPLETED SUCCESSFULLY")
             print("=" * 80)
@@ -950,8 +1128,8 @@ def check_username_availability(event, cors_headers=None):
         except ClientError as db_error:
             return {
                 'statusCode': 500,
-                'headers': cors_headers if cors_headers else get_cors_headers(),
-                'body': json.dumps({
+                'headers': cors_headers,
+                'body': _dumps({
                     'error': 'Database error',
                     'message': str(db_error)
                 })
@@ -959,8 +1137,8 @@ def check_username_availability(event, cors_headers=None):
         except Exception as db_error:
             return {
                 'statusCode': 500,
-                'headers': cors_headers if cors_headers else get_cors_headers(),
-                'body': json.dumps({
+                'headers': cors_headers,
+                'body': _dumps({
                     'error': 'Database error',
                     'message': str(db_error)
                 })
@@ -968,10 +1146,17 @@ def check_username_availability(event, cors_headers=None):
     except Exception as e:
         return {
             'statusCode': 500,
-            'headers': cors_headers if cors_headers else get_cors_headers(),
-            'body': json.dumps({
+            'headers': cors_headers,
+            'body': _dumps({
                 'error': 'Internal server error',
                 'message': str(e),
                 'error_type': type(e).__name__
             })
-        }
\ No newline at end of file
+        }
+# Static routes resolved with a single dict lookup; dynamic paths (prefix or
+# substring matches) are handled by _match_dynamic with at most two comparisons.
+# Defined last so all route handlers exist when the table is built.
+_ROUTES = {
+    ('GET', '/users/me'): get_current_user_profile,
+    ('POST', '/profiles'): create_or_update_profile,
+}
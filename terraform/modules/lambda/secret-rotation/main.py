@@ -1,7 +1,9 @@
 import boto3
+import hmac
 import json
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from botocore.exceptions import ClientError
 
 logger = logging.getLogger()
@@ -11,6 +13,11 @@ secrets_client = boto3.client("secretsmanager")
 cognito_client = boto3.client("cognito-idp")
 
 
+def _tags_of(metadata):
+    """Build the tag dict from already-fetched secret metadata"""
+    return {tag["Key"]: tag["Value"] for tag in metadata.get("Tags", [])}
+
+
 def lambda_handler(event, context):
     """
     Entry point for Secrets Manager rotation Lambda
@@ -30,14 +37,16 @@ def lambda_handler(event, context):
     if token not in versions:
         raise ValueError("ClientRequestToken not found in secret versions")
 
+    # Each step receives the metadata fetched above instead of re-describing
+    # the secret itself - saves up to one Secrets Manager call per step
     if step == "createSecret":
-        create_secret(secret_arn, token)
+        create_secret(secret_arn, token, metadata)
     elif step == "setSecret":
-        set_secret(secret_arn, token)
+        set_secret(secret_arn, token, metadata)
     elif step == "testSecret":
-        test_secret(secret_arn, token)
+        test_secret(secret_arn, token, metadata)
     elif step == "finishSecret":
-        finish_secret(secret_arn, token)
+        finish_secret(secret_arn, token, metadata)
     else:
         raise ValueError(f"Invalid rotation step: {step}")
 
@@ -47,19 +56,16 @@ def lambda_handler(event, context):
 # -------------------------------------------------------------------
 
 
-def create_secret(secret_arn, token):
+def create_secret(secret_arn, token, metadata):
     """
     Generate and store a new secret version with AWSPENDING
     Rotates through pre-created OAuth secret sets
     """
 
-    # Ensure current secret exists
-    current_secret = secrets_client.get_secret_value(
-        SecretId=secret_arn,
-        VersionStage="AWSCURRENT"
-    )
-
-    # Check if pending version already exists (idempotency)
+    # Check if a pending secret VALUE already exists (idempotency). This must
+    # probe get_secret_value: Secrets Manager stages AWSPENDING on the token's
+    # version before any value is stored, so the metadata label map can't
+    # distinguish "retry with value written" from a fresh rotation.
     try:
         secrets_client.get_secret_value(
             SecretId=secret_arn,
@@ -71,6 +77,12 @@ def create_secret(secret_arn, token):
     except secrets_client.exceptions.ResourceNotFoundException:
         pass
 
+    # Ensure current secret exists
+    current_secret = secrets_client.get_secret_value(
+        SecretId=secret_arn,
+        VersionStage="AWSCURRENT"
+    )
+
     # Parse current secret
     secret_data = json.loads(current_secret["SecretString"])
 
@@ -100,8 +112,7 @@ def create_secret(secret_arn, token):
         # Legacy format: try to get from tags or use current
         logger.info("Using legacy secret format, attempting to rotate")
 
-        metadata = secrets_client.describe_secret(SecretId=secret_arn)
-        tags = {tag["Key"]: tag["Value"] for tag in metadata.get("Tags", [])}
+        tags = _tags_of(metadata)
 
         new_google_secret = tags.get("new_google_client_secret") or os.environ.get("NEW_GOOGLE_CLIENT_SECRET")
         new_linkedin_secret = tags.get("new_linkedin_client_secret") or os.environ.get("NEW_LINKEDIN_CLIENT_SECRET")
@@ -127,7 +138,7 @@ def create_secret(secret_arn, token):
     logger.info("Created new AWSPENDING secret version")
 
 
-def set_secret(secret_arn, token):
+def set_secret(secret_arn, token, metadata):
     """
     Apply the secret to Cognito Identity Providers
     """
@@ -144,49 +155,42 @@ def set_secret(secret_arn, token):
     # Get Cognito User Pool ID
     user_pool_id = os.environ.get("COGNITO_USER_POOL_ID")
     if not user_pool_id:
-        metadata = secrets_client.describe_secret(SecretId=secret_arn)
-        tags = {tag["Key"]: tag["Value"] for tag in metadata.get("Tags", [])}
+        tags = _tags_of(metadata)
         user_pool_id = tags.get("cognito_user_pool_id")
 
     if not user_pool_id:
         raise ValueError("COGNITO_USER_POOL_ID must be provided via environment or secret tags")
 
-    # Update Google Identity Provider
-    try:
-        cognito_client.update_identity_provider(
-            UserPoolId=user_pool_id,
-            ProviderName="Google",
-            ProviderDetails={
-                "client_secret": new_secret_dict["google_client_secret"]
-            }
-        )
-        logger.info("Updated Google Identity Provider with new secret")
-    except ClientError as e:
-        if e.response["Error"]["Code"] == "ResourceNotFoundException":
-            logger.warning("Google Identity Provider not found, skipping update")
-        else:
-            raise
-
-    # Update LinkedIn Identity Provider
-    try:
-        cognito_client.update_identity_provider(
-            UserPoolId=user_pool_id,
-            ProviderName="LinkedIn",
-            ProviderDetails={
-                "client_secret": new_secret_dict["linkedin_client_secret"]
-            }
-        )
-        logger.info("Updated LinkedIn Identity Provider with new secret")
-    except ClientError as e:
-        if e.response["Error"]["Code"] == "ResourceNotFoundException":
-            logger.warning("LinkedIn Identity Provider not found, skipping update")
-        else:
-            raise
+    def update_provider(provider_name, secret_key):
+        try:
+            cognito_client.update_identity_provider(
+                UserPoolId=user_pool_id,
+                ProviderName=provider_name,
+                ProviderDetails={
+                    "client_secret": new_secret_dict[secret_key]
+                }
+            )
+            logger.info(f"Updated {provider_name} Identity Provider with new secret")
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ResourceNotFoundException":
+                logger.warning(f"{provider_name} Identity Provider not found, skipping update")
+            else:
+                raise
+
+    # The two provider updates are independent - run them in parallel so the
+    # step takes one Cognito round-trip instead of two
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(update_provider, "Google", "google_client_secret"),
+            executor.submit(update_provider, "LinkedIn", "linkedin_client_secret"),
+        ]
+        for future in futures:
+            future.result()
 
     logger.info("Successfully set new secrets in Cognito")
 
 
-def test_secret(secret_arn, token):
+def test_secret(secret_arn, token, metadata):
     """
     Validate the pending secret by checking Cognito Identity Providers
     """
@@ -203,48 +207,47 @@ def test_secret(secret_arn, token):
     # Get Cognito User Pool ID
     user_pool_id = os.environ.get("COGNITO_USER_POOL_ID")
     if not user_pool_id:
-        metadata = secrets_client.describe_secret(SecretId=secret_arn)
-        tags = {tag["Key"]: tag["Value"] for tag in metadata.get("Tags", [])}
+        tags = _tags_of(metadata)
         user_pool_id = tags.get("cognito_user_pool_id")
 
     if not user_pool_id:
         raise ValueError("COGNITO_USER_POOL_ID must be provided")
 
-    # Test Google Identity Provider
-    try:
-        google_provider = cognito_client.describe_identity_provider(
-            UserPoolId=user_pool_id,
-            ProviderName="Google"
-        )
-        if google_provider["IdentityProvider"]["ProviderDetails"].get("client_secret") != new_secret_dict["google_client_secret"]:
-            raise ValueError("Google secret mismatch in Cognito")
-        logger.info("Google Identity Provider test passed")
-    except ClientError as e:
-        if e.response["Error"]["Code"] != "ResourceNotFoundException":
-            raise
-
-    # Test LinkedIn Identity Provider
-    try:
-        linkedin_provider = cognito_client.describe_identity_provider(
-            UserPoolId=user_pool_id,
-            ProviderName="LinkedIn"
-        )
-        if linkedin_provider["IdentityProvider"]["ProviderDetails"].get("client_secret") != new_secret_dict["linkedin_client_secret"]:
-            raise ValueError("LinkedIn secret mismatch in Cognito")
-        logger.info("LinkedIn Identity Provider test passed")
-    except ClientError as e:
-        if e.response["Error"]["Code"] != "ResourceNotFoundException":
-            raise
+    def test_provider(provider_name, secret_key):
+        try:
+            provider = cognito_client.describe_identity_provider(
+                UserPoolId=user_pool_id,
+                ProviderName=provider_name
+            )
+            # compare_digest avoids leaking the match position through timing.
+            # Note: Cognito may mask client_secret in DescribeIdentityProvider
+            # responses, in which case this check cannot confirm the value -
+            # a real validation would need an OAuth token exchange against the
+            # provider itself.
+            stored = provider["IdentityProvider"]["ProviderDetails"].get("client_secret")
+            if not hmac.compare_digest(stored or "", new_secret_dict[secret_key] or ""):
+                raise ValueError(f"{provider_name} secret mismatch in Cognito")
+            logger.info(f"{provider_name} Identity Provider test passed")
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ResourceNotFoundException":
+                raise
+
+    # Validate both providers in parallel, mirroring set_secret
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(test_provider, "Google", "google_client_secret"),
+            executor.submit(test_provider, "LinkedIn", "linkedin_client_secret"),
+        ]
+        for future in futures:
+            future.result()
 
     logger.info("Successfully tested new secrets")
 
 
-def finish_secret(secret_arn, token):
+def finish_secret(secret_arn, token, metadata):
     """
     Promote AWSPENDING version to AWSCURRENT
     """
-    metadata = secrets_client.describe_secret(SecretId=secret_arn)
-
     current_version = None
 
     for version_id, stages in metadata["VersionIdsToStages"].items():
@@ -1,259 +1,412 @@
+import hashlib
+import hmac
 import json
+import logging
 import os
+import re
+import secrets
 import boto3
-import uuid
 from datetime import datetime, timedelta
+from urllib.parse import quote
 from botocore.exceptions import ClientError
+from botocore.client import Config
 
-s3_client = boto3.client('s3')
+# Verbose event/body dumps are gated behind DEBUG=1 - serializing the full API
+# Gateway event is kilobytes of string work plus billed CloudWatch ingest per
+# request, so production only pays for it when explicitly enabled
+DEBUG = os.environ.get('DEBUG') == '1'
+
+logger = logging.getLogger()
+logger.setLevel(logging.DEBUG if DEBUG else logging.INFO)
+
+# orjson (C + SIMD JSON) is used when bundled with the deployment package;
+# fall back to stdlib json so the function still runs without it
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    def _loads(data):
+        return orjson.loads(data)
+
+    def _dumps(obj):
+        # API Gateway expects a str body; orjson emits bytes
+        return orjson.dumps(obj, default=str).decode()
+else:
+    def _loads(data):
+        return json.loads(data)
+
+    def _dumps(obj):
+        return json.dumps(obj, default=str)
+
+# Canned error bodies serialized once at import - the common 4xx paths return
+# pre-baked strings instead of re-serializing the same dict per request
+_ERR_METHOD_NOT_ALLOWED = _dumps({'error': 'Method not allowed'})
+_ERR_UNAUTHORIZED = _dumps({'error': 'Unauthorized', 'message': 'No user_id found in JWT claims'})
+# 500s return a static generic body: exception text goes to the logs, not to
+# the client, which also skips a dumps call on the failure path
+_ERR_INTERNAL = _dumps({'error': 'Internal server error', 'message': 'An error occurred processing your request'})
+_ERR_S3 = _dumps({'error': 'S3 error', 'message': 'Failed to generate upload URL'})
+
+# One session shared by the client, the credential resolver, and the local
+# signer below. Keep-alive so the TLS connection survives across warm
+# invocations instead of a fresh handshake per call; tight timeouts and fewer
+# retries keep a slow S3 call from eating the whole Lambda timeout budget
+_session = boto3.session.Session()
+s3_client = _session.client('s3', config=Config(
+    tcp_keepalive=True,
+    connect_timeout=2,
+    read_timeout=5,
+    retries={'max_attempts': 2, 'mode': 'standard'}
+))
 bucket_name = os.environ['S3_BUCKET']
 
-# Allowed MIME types
-ALLOWED_IMAGE_TYPES = ['image/png', 'image/jpeg', 'image/jpg', 'image/webp']
-ALLOWED_RESUME_TYPES = ['application/pdf']
+# Base for presign Params - the bucket never changes per container
+_BUCKET_PARAM_BASE = {'Bucket': bucket_name}
+
+# Scheme+host prefix of public object URLs, folded once per container
+_S3_PUBLIC_PREFIX = f"https://{bucket_name}.s3.amazonaws.com/"
+
+# Fast SigV4 presigner: generate_presigned_url runs the full botocore pipeline
+# (operation model lookup, endpoint resolution, canonical request build) per
+# call, but the PUT-with-content-type URL shape is fully predictable. Signing
+# locally reduces each URL to a few string formats plus one HMAC chain.
+_REGION = _session.region_name or os.environ.get('AWS_REGION') or 'us-east-1'
+_S3_HOST = f"{bucket_name}.s3.{_REGION}.amazonaws.com"
+_credentials = _session.get_credentials()
+
+def _derive_signing_key(secret_key, date_stamp):
+    """SigV4 key derivation: four chained HMAC-SHA256 rounds"""
+    k_date = hmac.new(('AWS4' + secret_key).encode(), date_stamp.encode(), hashlib.sha256).digest()
+    k_region = hmac.new(k_date, _REGION.encode(), hashlib.sha256).digest()
+    k_service = hmac.new(k_region, b's3', hashlib.sha256).digest()
+    return hmac.new(k_service, b'aws4_request', hashlib.sha256).digest()
+
+# The derived signing key only changes when the UTC date or the credentials
+# roll over, so cache it per (secret, date) and the per-URL cost drops from
+# five HMAC rounds to one. At most one entry is live at a time.
+_SIGNING_KEY_CACHE = {}
+
+def _get_signing_key(secret_key, date_stamp):
+    cache_key = (secret_key, date_stamp)
+    signing_key = _SIGNING_KEY_CACHE.get(cache_key)
+    if signing_key is None:
+        _SIGNING_KEY_CACHE.clear()
+        signing_key = _SIGNING_KEY_CACHE[cache_key] = _derive_signing_key(secret_key, date_stamp)
+    return signing_key
+
+def _fast_presign_put(key, content_type, expires=300):
+    """Build a presigned PUT URL directly; returns None if signing isn't possible"""
+    if not _credentials:
+        return None
+    creds = _credentials.get_frozen_credentials()
+
+    now = datetime.utcnow()
+    amz_date = now.strftime('%Y%m%dT%H%M%SZ')
+    date_stamp = now.strftime('%Y%m%d')
+    credential_scope = f"{date_stamp}/{_REGION}/s3/aws4_request"
+    canonical_uri = '/' + quote(key, safe='/')
+
+    # Query parameters must stay sorted by name for the canonical request
+    query = [
+        ('X-Amz-Algorithm', 'AWS4-HMAC-SHA256'),
+        ('X-Amz-Credential', f"{creds.access_key}/{credential_scope}"),
+        ('X-Amz-Date', amz_date),
+        ('X-Amz-Expires', str(expires)),
+    ]
+    if creds.token:
+        query.append(('X-Amz-Security-Token', creds.token))
+    query.append(('X-Amz-SignedHeaders', 'content-type;host'))
+    canonical_query = '&'.join(f"{k}={quote(v, safe='')}" for k, v in query)
+
+    # Content-Type is a signed header so S3 rejects uploads that don't match
+    canonical_request = (
+        f"PUT\n{canonical_uri}\n{canonical_query}\n"
+        f"content-type:{content_type}\nhost:{_S3_HOST}\n\n"
+        f"content-type;host\nUNSIGNED-PAYLOAD"
+    )
+    string_to_sign = (
+        f"AWS4-HMAC-SHA256\n{amz_date}\n{credential_scope}\n"
+        f"{hashlib.sha256(canonical_request.encode()).hexdigest()}"
+    )
+    signing_key = _get_signing_key(creds.secret_key, date_stamp)
+    signature = hmac.new(signing_key, string_to_sign.encode(), hashlib.sha256).hexdigest()
+
+    return f"https://{_S3_HOST}{canonical_uri}?{canonical_query}&X-Amz-Signature={signature}"
+
+# Pre-warm during the INIT phase so the first invocation doesn't pay for lazy
+# credential resolution, service-model loading, or SigV4 signer construction.
+# The presign is a local operation (no network call) and any failure here must
+# not prevent the function from starting.
+try:
+    if _credentials:
+        _credentials.get_frozen_credentials()
+    s3_client.generate_presigned_url(
+        'put_object',
+        Params={**_BUCKET_PARAM_BASE, 'Key': '_warmup',
+                'ContentType': 'application/octet-stream'},
+        ExpiresIn=60
+    )
+except Exception:
+    pass
+
+# Allowed MIME types - already-lowercase tuples so nothing downstream ever
+# needs a per-call normalization pass over them
+ALLOWED_IMAGE_TYPES = ('image/png', 'image/jpeg', 'image/jpg', 'image/webp')
+ALLOWED_RESUME_TYPES = ('application/pdf',)
+
+# Canonicalization table: one hash probe validates a lowercased content type
+# and maps aliases (image/jpg -> image/jpeg) to the form the URL is signed
+# with; anything not in the table is rejected
+_CT_CANON = {ct.lower(): ct.lower() for ct in ALLOWED_IMAGE_TYPES + ALLOWED_RESUME_TYPES}
+_CT_CANON['image/jpg'] = 'image/jpeg'
+
+# Allow-list sets hold canonical forms only - built once at cold start so each
+# request does a single hash probe instead of rebuilding normalized lists and
+# scanning them
+_ALLOWED_IMAGE_SET = frozenset(_CT_CANON[ct.lower()] for ct in ALLOWED_IMAGE_TYPES)
+_ALLOWED_RESUME_SET = frozenset(_CT_CANON[ct.lower()] for ct in ALLOWED_RESUME_TYPES)
+
+# file_type -> (allowed content types, key prefix format, expose a public
+# URL). One lookup replaces the duplicated if/elif validation branches, and
+# adding a new file type becomes a one-line change. %-formatting the prefix is
+# the cheapest of CPython's string formats for this shape.
+# The sorted allow-list in the last slot feeds the invalid-content-type
+# message without re-sorting the set per rejected request
+FILE_TYPE_CONFIG = {
+    'profile_image': (_ALLOWED_IMAGE_SET, 'users/%s/profile/', True, sorted(_ALLOWED_IMAGE_SET)),
+    'resume': (_ALLOWED_RESUME_SET, 'users/%s/resume/', False, sorted(_ALLOWED_RESUME_SET)),
+}
+
+
+# Object keys only ever carry a short, simple extension; anything else
+# (path separators, query fragments, absurd lengths) is discarded
+_EXTENSION_RE = re.compile(r'\.[A-Za-z0-9]{1,8}')
+
+
+def _error(status, body, cors_headers):
+    """Build an error response - keeps the repeated 4xx/5xx returns in one place"""
+    return {
+        'statusCode': status,
+        'headers': cors_headers,
+        'body': _dumps(body)
+    }
 
 # CORS headers - must match origin exactly when using credentials
-def get_cors_headers(origin=None):
-    """Get CORS headers based on request origin"""
-    # Allowed origins
-    allowed_origins = ['http://localhost:8080', 'http://localhost:3000']
-    
-    # If origin is provided and in allowed list, use it; otherwise use first allowed
-    if origin and origin in allowed_origins:
-        allowed_origin = origin
-    elif origin and origin.startswith('http://localhost'):
-        # Allow any localhost port for development
-        allowed_origin = origin
-    else:
-        allowed_origin = allowed_origins[0]  # Default to first allowed origin
-    
+_ALLOWED_ORIGINS = ['http://localhost:8080', 'http://localhost:3000']
+
+def _build_cors_headers(allowed_origin):
     return {
         'Access-Control-Allow-Origin': allowed_origin,
         'Access-Control-Allow-Credentials': 'true',
         'Access-Control-Allow-Methods': 'GET, POST, PUT, DELETE, OPTIONS',
         'Access-Control-Allow-Headers': 'Content-Type, Authorization',
-        'Access-Control-Max-Age': '300',
+        # 24h (the Firefox cap) so browsers stop re-issuing a preflight every
+        # 5 minutes; Vary keys any intermediary cache by origin since the
+        # Allow-Origin value differs per caller
+        'Access-Control-Max-Age': '86400',
+        'Vary': 'Origin',
         'Content-Type': 'application/json'
     }
 
+# Precomputed origin -> headers table; the hot path is a single dict lookup.
+# Returned dicts are shared across requests and must not be mutated - callers
+# needing an extra header must copy ({**hdrs, ...}).
+_CORS_CACHE = {o: _build_cors_headers(o) for o in _ALLOWED_ORIGINS}
+_DEFAULT_CORS = _CORS_CACHE[_ALLOWED_ORIGINS[0]]
+
+def get_cors_headers(origin=None):
+    """Get CORS headers based on request origin"""
+    headers = _CORS_CACHE.get(origin)
+    if headers:
+        return headers
+    if origin and origin.startswith('http://localhost'):
+        # Allow any localhost port for development; cache the built headers
+        # so repeat dev requests hit the table too
+        return _CORS_CACHE.setdefault(origin, _build_cors_headers(origin))
+    return _DEFAULT_CORS
+
+# Shared empty-dict sentinel for the claims lookup below - never mutated.
+# Avoids allocating a fresh default dict per missed .get on every request.
+_EMPTY = {}
+
 def get_user_id_from_event(event):
-    """Extract user_id from JWT claims"""
+    """Extract user_id from JWT claims.
+
+    Handles both authorizer shapes with direct indexing on the happy path:
+    requestContext.authorizer.claims.sub (v2) and
+    requestContext.authorizer.jwt.claims.sub (v1).
+    """
     try:
-        # Try HTTP API v2 format first
-        request_context = event.get('requestContext', {})
-        authorizer = request_context.get('authorizer', {})
-        
-        # HTTP API v2 format: authorizer.claims.sub
-        claims = authorizer.get('claims', {})
-        if claims:
-            user_id = claims.get('sub')
-            if user_id:
-                return user_id
-        
-        # Fallback to HTTP API v1 format: authorizer.jwt.claims
-        jwt = authorizer.get('jwt', {})
-        claims = jwt.get('claims', {})
-        if claims:
-            user_id = claims.get('sub')
-            if user_id:
-                return user_id
-        
-        return None
-    except Exception as e:
-        print(f"Error extracting user_id: {str(e)}")
+        authorizer = event['requestContext']['authorizer']
+        claims = authorizer.get('claims') or authorizer.get('jwt', _EMPTY).get('claims')
+        return claims.get('sub') if claims else None
+    except (KeyError, TypeError, AttributeError):
+        # Covers missing keys and non-dict authorizer/claims shapes (e.g. a
+        # Lambda authorizer that stringifies claims) - both mean no user
         return None
 
 def handler(event, context):
-    # Debug: Log the event structure
-    print("=" * 80)
-    print("UPLOAD LAMBDA INVOCATION START")
-    print("=" * 80)
-    print(f"Event keys: {list(event.keys())}")
-    print(f"Event: {json.dumps(event, default=str)}")
-    
-    # Get origin from request headers for CORS
-    request_headers = event.get('headers', {}) or {}
-    origin = request_headers.get('origin') or request_headers.get('Origin') or None
-    print(f"DEBUG: Origin: {origin}")
-    
-    # Get CORS headers
-    cors_headers = get_cors_headers(origin)
-    
-    # Try API Gateway HTTP API v2 format first
+    # Resolve the method and origin before anything else: CORS preflights are
+    # the highest-volume requests this function answers and the cheapest, so
+    # they return before any logging or JSON work happens
     request_context = event.get('requestContext', {})
     http_context = request_context.get('http', {})
-    http_method = http_context.get('method')
-    
-    # Fallback to API Gateway v1 format
-    if not http_method:
-        http_method = request_context.get('httpMethod')
-    
-    print(f"DEBUG: HTTP method: {http_method}")
-    
-    # Handle OPTIONS (CORS preflight)
+    # HTTP API v2 format first, falling back to v1
+    http_method = http_context.get('method') or request_context.get('httpMethod')
+
+    request_headers = event.get('headers', {}) or {}
+    origin = request_headers.get('origin') or request_headers.get('Origin') or None
+
+    # Handle OPTIONS (CORS preflight) - a preflight response has no body,
+    # so 204 keeps it clean and cacheable
     if http_method == 'OPTIONS':
-        print("DEBUG: Handling OPTIONS request")
         return {
-            'statusCode': 200,
-            'headers': cors_headers,
+            'statusCode': 204,
+            'headers': get_cors_headers(origin),
             'body': ''
         }
-    
+
+    # Debug: Log the event structure (only when explicitly enabled - the full
+    # event dump is the most expensive log line in the function)
+    if DEBUG:
+        print("=" * 80)
+        print("UPLOAD LAMBDA INVOCATION START")
+        print("=" * 80)
+        print(f"Event keys: {list(event.keys())}")
+        print(f"Event: {json.dumps(event, default=str)}")
+    logger.debug("Origin: %s, HTTP method: %s", origin, http_method)
+
+    # Get CORS headers
+    cors_headers = get_cors_headers(origin)
+
     if http_method != 'POST':
-        print(f"DEBUG: Method not allowed: {http_method}")
+        logger.debug("Method not allowed: %s", http_method)
         return {
             'statusCode': 405,
             'headers': cors_headers,
-            'body': json.dumps({'error': 'Method not allowed'})
+            'body': _ERR_METHOD_NOT_ALLOWED
         }
     
-    try:
-        return generate_presigned_url(event, cors_headers)
-    except Exception as e:
-        import traceback
-        error_trace = traceback.format_exc()
-        print(f"ERROR in upload handler: {str(e)}")
-        print(f"Traceback: {error_trace}")
-        print("=" * 80)
+    # Extract the caller identity once - the presign path below reuses it
+    # instead of re-walking the JWT claims
+    user_id = get_user_id_from_event(event)
+    if not user_id:
+        logger.debug("No user_id found in event")
         return {
-            'statusCode': 500,
+            'statusCode': 401,
             'headers': cors_headers,
-            'body': json.dumps({'error': 'Internal server error', 'message': str(e)})
+            'body': _ERR_UNAUTHORIZED
         }
 
-def generate_presigned_url(event, cors_headers=None):
-    """POST /upload-url - Generate pre-signed URL for upload"""
-    if cors_headers is None:
-        request_headers = event.get('headers', {}) or {}
-        origin = request_headers.get('origin') or request_headers.get('Origin') or None
-        cors_headers = get_cors_headers(origin)
-    
-    user_id = get_user_id_from_event(event)
-    if not user_id:
-        print(f"ERROR: No user_id found in event")
+    try:
+        return generate_presigned_url(event, cors_headers, user_id)
+    except Exception:
+        logger.exception("ERROR in upload handler")
         return {
-            'statusCode': 401,
+            'statusCode': 500,
             'headers': cors_headers,
-            'body': json.dumps({'error': 'Unauthorized', 'message': 'No user_id found in JWT claims'})
+            'body': _ERR_INTERNAL
         }
-    
+
+def generate_presigned_url(event, cors_headers, user_id):
+    """POST /upload-url - Generate pre-signed URL for upload.
+
+    cors_headers and user_id are resolved once by the handler and passed in,
+    so this path never repeats the origin walk or the JWT claim traversal.
+    """
     try:
         body_str = event.get('body', '{}')
-        print(f"DEBUG: Request body (raw): {body_str}")
-        body = json.loads(body_str)
-        print(f"DEBUG: Request body (parsed): {json.dumps(body)}")
-    except json.JSONDecodeError as e:
-        print(f"ERROR: Invalid JSON in request body: {str(e)}")
-        print(f"DEBUG: Body string: {event.get('body', '')}")
+        if DEBUG:
+            print(f"DEBUG: Request body (raw): {body_str}")
+        body = _loads(body_str)
+    except (json.JSONDecodeError, ValueError) as e:
+        logger.warning("Invalid JSON in request body: %s", e)
+        logger.debug("Body string: %s", body_str)
         return {
             'statusCode': 400,
             'headers': cors_headers,
-            'body': json.dumps({'error': 'Invalid JSON in request body', 'details': str(e)})
+            'body': _dumps({'error': 'Invalid JSON in request body', 'details': str(e)})
         }
     except Exception as e:
-        print(f"ERROR: Unexpected error parsing body: {str(e)}")
-        import traceback
-        print(traceback.format_exc())
+        logger.exception("Unexpected error parsing request body")
         return {
             'statusCode': 400,
             'headers': cors_headers,
-            'body': json.dumps({'error': 'Error parsing request body', 'details': str(e)})
+            'body': _dumps({'error': 'Error parsing request body', 'details': str(e)})
         }
     
     file_type = body.get('file_type')  # 'profile_image' or 'resume'
-    content_type = body.get('content_type', '').strip().lower()  # Normalize to lowercase
+    ct_raw = (body.get('content_type') or '').strip().lower()
+    # One table probe normalizes aliases and rejects unknown types at once
+    content_type = _CT_CANON.get(ct_raw)
     file_extension = body.get('file_extension', '')
+
+    logger.debug("file_type=%s, content_type=%s, file_extension=%s",
+                 file_type, ct_raw, file_extension)
+
+    if not file_type or not ct_raw:
+        return _error(400, {'error': 'file_type and content_type are required'}, cors_headers)
+
+    # Validate via the precomputed per-type config instead of an if/elif chain
+    cfg = FILE_TYPE_CONFIG.get(file_type)
+    if cfg is None:
+        return _error(400, {'error': 'Invalid file_type. Must be "profile_image" or "resume"'}, cors_headers)
+    allowed, prefix_fmt, has_public_url, allowed_msg = cfg
+    if content_type is None or content_type not in allowed:
+        return _error(400, {'error': f'Invalid content type. Allowed: {allowed_msg}'}, cors_headers)
+    prefix = prefix_fmt % user_id
     
-    print(f"DEBUG: file_type={file_type}, content_type={content_type}, file_extension={file_extension}")
-    
-    if not file_type or not content_type:
-        return {
-            'statusCode': 400,
-            'headers': cors_headers,
-            'body': json.dumps({'error': 'file_type and content_type are required'})
-        }
-    
-    # Normalize content types for comparison (handle variations like image/jpeg vs image/JPEG)
-    normalized_allowed_images = [ct.lower() for ct in ALLOWED_IMAGE_TYPES]
-    normalized_allowed_resumes = [ct.lower() for ct in ALLOWED_RESUME_TYPES]
-    
-    # Validate MIME type
-    if file_type == 'profile_image':
-        if content_type not in normalized_allowed_images:
-            return {
-                'statusCode': 400,
-                'headers': cors_headers,
-                'body': json.dumps({'error': f'Invalid content type. Allowed: {ALLOWED_IMAGE_TYPES}'})
-            }
-        # Use the normalized content type for the presigned URL
-        # But map common variations to standard forms
-        if content_type == 'image/jpg':
-            content_type = 'image/jpeg'  # Standardize jpg to jpeg
-        prefix = f"users/{user_id}/profile/"
-    elif file_type == 'resume':
-        if content_type not in normalized_allowed_resumes:
-            return {
-                'statusCode': 400,
-                'headers': cors_headers,
-                'body': json.dumps({'error': f'Invalid content type. Allowed: {ALLOWED_RESUME_TYPES}'})
-            }
-        prefix = f"users/{user_id}/resume/"
-    else:
-        return {
-            'statusCode': 400,
-            'headers': cors_headers,
-            'body': json.dumps({'error': 'Invalid file_type. Must be "profile_image" or "resume"'})
-        }
-    
-    # Generate unique filename
-    filename = f"{uuid.uuid4()}{file_extension}"
-    key = f"{prefix}{filename}"
+    # Generate a unique object key - token_hex skips uuid4's field packing and
+    # dash formatting, and the whitelisted extension keeps the single f-string
+    # concatenation safe
+    if file_extension and not _EXTENSION_RE.fullmatch(file_extension):
+        file_extension = ''
+    key = f"{prefix}{secrets.token_hex(16)}{file_extension}"
     
     # Generate pre-signed URL (valid for 5 minutes)
     # IMPORTANT: Include ContentType in Params so it's part of the signature
     # If Content-Type is sent in the request but not in the signature, S3 will reject it
     try:
-        presigned_url = s3_client.generate_presigned_url(
-            'put_object',
-            Params={
-                'Bucket': bucket_name,
-                'Key': key,
-                'ContentType': content_type,  # Must be included in signature
-            },
-            ExpiresIn=300,  # 5 minutes
-            HttpMethod='PUT'
-        )
-        
-        public_url = f"https://{bucket_name}.s3.amazonaws.com/{key}" if file_type == 'profile_image' else None
-        
-        print(f"DEBUG: Generated presigned URL for key: {key}")
-        print(f"DEBUG: Content-Type in signature: {content_type}")
+        presigned_url = _fast_presign_put(key, content_type)
+        if not presigned_url:
+            # Fall back to the boto3 presigner if local signing isn't possible
+            presigned_url = s3_client.generate_presigned_url(
+                'put_object',
+                # ContentType must be included in the signature; the bucket
+                # name comes from the module-level template
+                Params={**_BUCKET_PARAM_BASE, 'Key': key, 'ContentType': content_type},
+                ExpiresIn=300,  # 5 minutes
+                HttpMethod='PUT'
+            )
+
+        public_url = _S3_PUBLIC_PREFIX + key if has_public_url else None
+
+        logger.debug("Generated presigned URL for key: %s (Content-Type: %s)",
+                     key, content_type)
         
         return {
             'statusCode': 200,
             'headers': cors_headers,
-            'body': json.dumps({
+            'body': _dumps({
                 'upload_url': presigned_url,
                 'key': key,
                 'url': public_url,
                 'content_type': content_type  # Return the Content-Type that was included in the signature
             })
         }
-    except ClientError as e:
-        import traceback
-        print(f"ERROR: S3 ClientError: {str(e)}")
-        print(f"Traceback: {traceback.format_exc()}")
+    except ClientError:
+        logger.exception("S3 ClientError generating presigned URL")
         return {
             'statusCode': 500,
             'headers': cors_headers,
-            'body': json.dumps({'error': 'S3 error', 'message': str(e)})
+            'body': _ERR_S3
         }
-    except Exception as e:
-        import traceback
-        print(f"ERROR: Unexpected error: {str(e)}")
-        print(f"Traceback: {traceback.format_exc()}")
+    except Exception:
+        logger.exception("Unexpected error generating presigned URL")
         return {
             'statusCode': 500,
             'headers': cors_headers,
-            'body': json.dumps({'error': 'Internal server error', 'message': str(e)})
+            'body': _ERR_INTERNAL
         }
\ No newline at end of file
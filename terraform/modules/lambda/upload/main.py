@@ -1,41 +1,203 @@
+import hashlib
+import hmac
 import json
+import logging
 import os
+import time
 import boto3
-import uuid
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from urllib.parse import quote
 from botocore.exceptions import ClientError, ParamValidationError
 from botocore.client import Config
 
-# Use Signature Version 4 (required for KMS-encrypted buckets)
-s3_client = boto3.client('s3', config=Config(signature_version='s3v4'))
+# Use Signature Version 4 (required for KMS-encrypted buckets).
+# tcp_keepalive keeps the TLS connection alive across warm invocations so S3
+# calls skip the per-call handshake; tight timeouts and fewer retries keep a
+# slow S3 call from eating the whole Lambda timeout budget. The session is
+# shared with the credential resolver for the local signer below.
+# An explicit endpoint_url short-circuits botocore's endpoint ruleset walk
+# (the dominant cost of its presigner); virtual addressing keeps the URLs in
+# the same bucket.s3.region.amazonaws.com shape the resolver would produce.
+_session = boto3.session.Session()
+_REGION = _session.region_name or os.environ.get('AWS_REGION') or 'us-east-1'
+s3_client = _session.client(
+    's3',
+    endpoint_url=f"https://s3.{_REGION}.amazonaws.com",
+    config=Config(
+        signature_version='s3v4',
+        s3={'addressing_style': 'virtual'},
+        tcp_keepalive=True,
+        max_pool_connections=10,
+        connect_timeout=2,
+        read_timeout=5,
+        retries={'max_attempts': 2, 'mode': 'standard'}
+    ))
 bucket_name = os.environ['S3_BUCKET']
 
+# Verbose event/body dumps are gated behind DEBUG=1 - serializing the full API
+# Gateway event is kilobytes of string work plus billed CloudWatch ingest per
+# request, so production only pays for it when explicitly enabled
+_DEBUG = os.environ.get('DEBUG') == '1'
+
+logger = logging.getLogger()
+logger.setLevel(logging.DEBUG if _DEBUG else logging.INFO)
+
+# orjson (C + SIMD JSON) is used when bundled with the deployment package;
+# fall back to stdlib json so the function still runs without it
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    def _loads(data):
+        return orjson.loads(data)
+
+    def _dumps(obj):
+        # API Gateway expects a str body; orjson emits bytes
+        return orjson.dumps(obj, default=str).decode()
+else:
+    def _loads(data):
+        return json.loads(data)
+
+    def _dumps(obj):
+        return json.dumps(obj, default=str)
+
+# Fast SigV4 presigner: s3_client.generate_presigned_url spends most of its
+# time in endpoint resolution and the generic operation pipeline, not in the
+# HMAC itself. The URL shapes here (GET, and PUT with a signed content type)
+# are fully predictable, so signing locally reduces each URL to a few string
+# formats plus one HMAC-SHA256 chain. The boto3 presigner remains as the
+# fallback whenever credentials can't be resolved.
+_S3_HOST = f"{bucket_name}.s3.{_REGION}.amazonaws.com"
+_credentials = _session.get_credentials()
+
+def _derive_signing_key(secret_key, date_stamp):
+    """SigV4 key derivation: four chained HMAC-SHA256 rounds"""
+    k_date = hmac.new(('AWS4' + secret_key).encode(), date_stamp.encode(), hashlib.sha256).digest()
+    k_region = hmac.new(k_date, _REGION.encode(), hashlib.sha256).digest()
+    k_service = hmac.new(k_region, b's3', hashlib.sha256).digest()
+    return hmac.new(k_service, b'aws4_request', hashlib.sha256).digest()
+
+# The derived signing key only changes when the UTC date or the credentials
+# roll over, so cache it per (secret, date) and the per-URL cost drops from
+# five HMAC rounds to one. At most one entry is live at a time.
+_SIGNING_KEY_CACHE = {}
+
+def _get_signing_key(secret_key, date_stamp):
+    cache_key = (secret_key, date_stamp)
+    signing_key = _SIGNING_KEY_CACHE.get(cache_key)
+    if signing_key is None:
+        _SIGNING_KEY_CACHE.clear()
+        signing_key = _SIGNING_KEY_CACHE[cache_key] = _derive_signing_key(secret_key, date_stamp)
+    return signing_key
+
+def _fast_presign(method, key, expires, content_type=None):
+    """Build a presigned URL directly; returns None if signing isn't possible.
+
+    For PUT, content_type is included as a signed header so S3 rejects
+    uploads whose Content-Type doesn't match the signature.
+    """
+    if not _credentials:
+        return None
+    creds = _credentials.get_frozen_credentials()
+
+    now = datetime.utcnow()
+    amz_date = now.strftime('%Y%m%dT%H%M%SZ')
+    date_stamp = now.strftime('%Y%m%d')
+    credential_scope = f"{date_stamp}/{_REGION}/s3/aws4_request"
+    canonical_uri = '/' + quote(key, safe='/')
+    signed_headers = 'content-type;host' if content_type else 'host'
+
+    # Query parameters must stay sorted by name for the canonical request
+    query = [
+        ('X-Amz-Algorithm', 'AWS4-HMAC-SHA256'),
+        ('X-Amz-Credential', f"{creds.access_key}/{credential_scope}"),
+        ('X-Amz-Date', amz_date),
+        ('X-Amz-Expires', str(expires)),
+    ]
+    if creds.token:
+        query.append(('X-Amz-Security-Token', creds.token))
+    query.append(('X-Amz-SignedHeaders', signed_headers))
+    canonical_query = '&'.join(f"{k}={quote(v, safe='')}" for k, v in query)
+
+    if content_type:
+        canonical_headers = f"content-type:{content_type}\nhost:{_S3_HOST}\n"
+    else:
+        canonical_headers = f"host:{_S3_HOST}\n"
+    canonical_request = (
+        f"{method}\n{canonical_uri}\n{canonical_query}\n"
+        f"{canonical_headers}\n{signed_headers}\nUNSIGNED-PAYLOAD"
+    )
+    string_to_sign = (
+        f"AWS4-HMAC-SHA256\n{amz_date}\n{credential_scope}\n"
+        f"{hashlib.sha256(canonical_request.encode()).hexdigest()}"
+    )
+    signing_key = _get_signing_key(creds.secret_key, date_stamp)
+    signature = hmac.new(signing_key, string_to_sign.encode(), hashlib.sha256).hexdigest()
+
+    return f"https://{_S3_HOST}{canonical_uri}?{canonical_query}&X-Amz-Signature={signature}"
+
+# Pre-warm during the INIT phase so the first invocation doesn't pay for lazy
+# credential resolution, service-model loading, or SigV4 signer construction.
+# The presign is a local operation (no network call) and any failure here must
+# not prevent the function from starting.
+try:
+    if _credentials:
+        _credentials.get_frozen_credentials()
+    s3_client.generate_presigned_url(
+        'put_object',
+        Params={'Bucket': bucket_name, 'Key': '_warmup',
+                'ContentType': 'application/octet-stream'},
+        ExpiresIn=60
+    )
+except Exception:
+    pass
+
 # Allowed MIME types
 ALLOWED_IMAGE_TYPES = ['image/png', 'image/jpeg', 'image/jpg', 'image/webp']
 ALLOWED_RESUME_TYPES = ['application/pdf']
 
-# CORS headers - must match origin exactly when using credentials
-def get_cors_headers(origin=None):
-    """Get CORS headers based on request origin"""
-    # Get allowed origins from environment variable, fallback to localhost for development
-    cors_origins_env = os.environ.get('CORS_ORIGINS', '')
-    if cors_origins_env:
-        allowed_origins = [origin.strip() for origin in cors_origins_env.split(',') if origin.strip()]
-    else:
-        # Fallback for development
-        allowed_origins = ['http://localhost:8080', 'http://localhost:3000']
-    
-    # If origin is provided and in allowed list, use it; otherwise use first allowed
-    if origin and origin in allowed_origins:
-        allowed_origin = origin
-    elif origin and origin.startswith('http://localhost') and not cors_origins_env:
-        # Allow any localhost port for development only (if no env var set)
-        allowed_origin = origin
-    elif allowed_origins:
-        allowed_origin = allowed_origins[0]  # Default to first allowed origin
-    else:
-        allowed_origin = '*'  # Fallback (should not happen in production)
-    
+# Lowercased allow-lists are container constants - built once at cold start so
+# each request does a single hash probe instead of rebuilding normalized lists
+# and scanning them
+_ALLOWED_IMAGE_SET = frozenset(ct.lower() for ct in ALLOWED_IMAGE_TYPES)
+_ALLOWED_RESUME_SET = frozenset(ct.lower() for ct in ALLOWED_RESUME_TYPES)
+
+# image/jpg is accepted from clients but folded to the canonical form before
+# it goes into the signature
+_JPG_CANONICAL = {'image/jpg': 'image/jpeg'}
+
+# Public presigned GET URLs are requested once per page view for the same
+# small set of profile/resume keys and stay valid for 15 minutes, so cache
+# them per key across warm invocations. OrderedDict gives LRU eviction; a
+# URL within 30s of expiry is treated as a miss and re-signed.
+_PUBLIC_URL_CACHE = OrderedDict()
+_PUBLIC_URL_CACHE_MAX = 1024
+_PUBLIC_URL_TTL = 900  # matches the 15-minute presign expiry
+_PUBLIC_URL_MARGIN = 30  # never serve a URL about to expire
+
+# file_type -> (key subdirectory, allowed content types, allow-list shown in
+# the error message); one lookup replaces the three-branch if/elif chain and
+# its duplicated validation code
+_DISPATCH = {
+    'profile_image': ('profile/', _ALLOWED_IMAGE_SET, ALLOWED_IMAGE_TYPES),
+    'project_image': ('projects/', _ALLOWED_IMAGE_SET, ALLOWED_IMAGE_TYPES),
+    'resume': ('resume/', _ALLOWED_RESUME_SET, ALLOWED_RESUME_TYPES),
+}
+
+# CORS headers - must match origin exactly when using credentials.
+# CORS_ORIGINS is env-driven and stable per container, so parse it once at
+# import instead of re-splitting it on every request.
+_CORS_ORIGINS_ENV = os.environ.get('CORS_ORIGINS', '')
+if _CORS_ORIGINS_ENV:
+    _ALLOWED_ORIGINS = [o.strip() for o in _CORS_ORIGINS_ENV.split(',') if o.strip()]
+else:
+    # Fallback for development
+    _ALLOWED_ORIGINS = ['http://localhost:8080', 'http://localhost:3000']
+
+def _build_cors_headers(allowed_origin):
     return {
         'Access-Control-Allow-Origin': allowed_origin,
         'Access-Control-Allow-Credentials': 'true',
@@ -45,126 +207,131 @@ def get_cors_headers(origin=None):
         'Content-Type': 'application/json'
     }
 
+# Precomputed origin -> headers table; the hot path is a single dict lookup.
+# Returned dicts are shared across requests and must not be mutated.
+_CORS_TABLE = {o: _build_cors_headers(o) for o in _ALLOWED_ORIGINS}
+_DEFAULT_CORS = _build_cors_headers(_ALLOWED_ORIGINS[0] if _ALLOWED_ORIGINS else '*')
+
+# Preflight responses are fully static per origin, so build the complete
+# response objects at import; answering OPTIONS is then a single dict lookup
+_PREFLIGHT = {o: {'statusCode': 200, 'headers': h, 'body': ''} for o, h in _CORS_TABLE.items()}
+_PREFLIGHT_DEFAULT = {'statusCode': 200, 'headers': _DEFAULT_CORS, 'body': ''}
+
+# Fixed-shape error bodies serialized once at import; the common 400/401/403/
+# 405 branches return a constant string instead of calling json.dumps per
+# request. Errors carrying dynamic details still serialize at runtime.
+_ERR_METHOD_NOT_ALLOWED = _dumps({'error': 'Method not allowed'})
+_ERR_UNAUTHORIZED = _dumps({'error': 'Unauthorized', 'message': 'No user_id found in JWT claims'})
+_ERR_MISSING_FIELDS = _dumps({'error': 'file_type and content_type are required'})
+_ERR_INVALID_FILE_TYPE = _dumps({'error': 'Invalid file_type. Must be "profile_image", "project_image", or "resume"'})
+_ERR_KEY_REQUIRED = _dumps({'error': 'key parameter is required'})
+_ERR_KEY_REQUIRED_PUBLIC = _dumps({'error': 'key parameter is required', 'message': 'key parameter is required'})
+_ERR_FORBIDDEN_OWN_FILES = _dumps({'error': 'Forbidden', 'message': 'You can only access your own files'})
+_ERR_FORBIDDEN_PUBLIC = _dumps({
+    'error': 'Forbidden',
+    'message': 'Public presigned URLs are only available for profile images and resumes'
+})
+
+def get_cors_headers(origin=None):
+    """Get CORS headers based on request origin"""
+    headers = _CORS_TABLE.get(origin)
+    if headers:
+        return headers
+    if origin and origin.startswith('http://localhost') and not _CORS_ORIGINS_ENV:
+        # Allow any localhost port for development only (if no env var set);
+        # cache the built headers so repeat dev requests hit the table too
+        return _CORS_TABLE.setdefault(origin, _build_cors_headers(origin))
+    return _DEFAULT_CORS
+
 def get_user_id_from_event(event):
-    """Extract user_id from JWT claims"""
+    """Extract user_id from JWT claims.
+
+    Checks authorizer.claims.sub (HTTP API v2) first, then
+    authorizer.jwt.claims.sub (v1).
+    """
     try:
-        # Try HTTP API v2 format first
-        request_context = event.get('requestContext', {})
-        authorizer = request_context.get('authorizer', {})
-        
-        # HTTP API v2 format: authorizer.claims.sub
-        claims = authorizer.get('claims', {})
-        if claims:
-            user_id = claims.get('sub')
-            if user_id:
-                return user_id
-        
-        # Fallback to HTTP API v1 format: authorizer.jwt.claims
-        jwt = authorizer.get('jwt', {})
-        claims = jwt.get('claims', {})
-        if claims:
-            user_id = claims.get('sub')
-            if user_id:
-                return user_id
-        
-        return None
-    except Exception as e:
-        print(f"Error extracting user_id: {str(e)}")
+        authorizer = (event.get('requestContext') or {}).get('authorizer') or {}
+        claims = authorizer.get('claims') or (authorizer.get('jwt') or {}).get('claims') or {}
+        return claims.get('sub')
+    except (KeyError, TypeError, AttributeError):
+        # Covers non-dict authorizer/claims shapes (e.g. a Lambda authorizer
+        # that stringifies claims) - both mean no user
         return None
 
 def handler(event, context):
-    # Default CORS headers in case of early error
-    default_cors_headers = get_cors_headers()
-    
+    # Resolve CORS headers once up front - the same dict serves the happy
+    # path and the catch-all error response below
+    request_headers = event.get('headers', {}) or {}
+    origin = request_headers.get('origin') or request_headers.get('Origin') or None
+
+    # Try API Gateway HTTP API v2 format first, then fall back to top-level
+    # httpMethod or requestContext.httpMethod
+    request_context = event.get('requestContext', {})
+    http_context = request_context.get('http', {})
+    http_method = (
+        http_context.get('method')
+        or event.get('httpMethod')
+        or request_context.get('httpMethod')
+    )
+
+    # Answer CORS preflights before any other work - browsers send these
+    # constantly and the whole response is prebuilt at import
+    if http_method == 'OPTIONS':
+        return _PREFLIGHT.get(origin, _PREFLIGHT_DEFAULT)
+
+    cors_headers = get_cors_headers(origin)
+
     try:
-        # Debug: Log the event structure
-        print("=" * 80)
-        print("UPLOAD LAMBDA INVOCATION START")
-        print("=" * 80)
-        print(f"Event keys: {list(event.keys())}")
-        print(f"Event: {json.dumps(event, default=str)}")
-        
-        # Get origin from request headers for CORS
-        request_headers = event.get('headers', {}) or {}
-        origin = request_headers.get('origin') or request_headers.get('Origin') or None
-        print(f"DEBUG: Origin: {origin}")
-        
-        # Get CORS headers
-        cors_headers = get_cors_headers(origin)
-        
-        # Try API Gateway HTTP API v2 format first
-        request_context = event.get('requestContext', {})
-        http_context = request_context.get('http', {})
-        http_method = http_context.get('method')
-        
-        # Fallback to top-level httpMethod or requestContext.httpMethod
-        if not http_method:
-            http_method = event.get('httpMethod') or request_context.get('httpMethod')
-        
-        print(f"DEBUG: HTTP method: {http_method}, event keys: {list(event.keys())}")
-        
-        # Handle OPTIONS (CORS preflight)
-        if http_method == 'OPTIONS':
-            print("DEBUG: Handling OPTIONS request")
-            return {
-                'statusCode': 200,
-                'headers': cors_headers,
-                'body': ''
-            }
-        
-        # Handle GET requests for presigned download URLs
+        # Debug: Log the event structure (only when explicitly enabled - the
+        # full event dump is the most expensive log line in the function)
+        if _DEBUG:
+            print("=" * 80)
+            print("UPLOAD LAMBDA INVOCATION START")
+            print("=" * 80)
+            print(f"Event keys: {','.join(event)}")
+            print(f"Event: {_dumps(event)}")
+        logger.debug("Origin: %s", origin)
+        logger.debug("HTTP method: %s, event keys: %s", http_method, event.keys())
+
+        # Route via the precomputed dispatch table - one dict lookup replaces
+        # the per-method if-chain. GET still inspects whichever path field
+        # this API Gateway payload format carries to spot the public endpoint.
+        route_path = None
         if http_method == 'GET':
-            # Check if this is a public endpoint
-            # Try multiple path sources to handle different API Gateway formats
-            path = http_context.get('path') or event.get('rawPath') or ''
-            if not path:
-                path = event.get('path') or request_context.get('path') or ''
-            
-            # Also check route key for API Gateway v2
+            path = (
+                http_context.get('path') or event.get('rawPath')
+                or event.get('path') or request_context.get('path') or ''
+            )
             route_key = http_context.get('routeKey') or request_context.get('routeKey') or ''
-            
-            # Check resourcePath as well (from the event you showed)
             resource_path = request_context.get('resourcePath') or ''
-            
-            print(f"DEBUG: GET request - path: {path}, route_key: {route_key}, resource_path: {resource_path}")
-            
-            # Check if this is the public endpoint (try all possible path formats)
-            is_public_endpoint = (
-                path.startswith('/public/presigned-url') or 
-                route_key == 'GET /public/presigned-url' or
-                resource_path == '/public/presigned-url' or
-                (path and '/public/presigned-url' in path)
-            )
-            
-            if is_public_endpoint:
-                print("DEBUG: Routing to public presigned URL handler")
-                return generate_presigned_get_url_public(event, cors_headers)
-            else:
-                print("DEBUG: Routing to authenticated presigned URL handler")
-                return generate_presigned_get_url(event, cors_headers)
-        
-        # Handle POST requests for presigned upload URLs
-        if http_method == 'POST':
-            return generate_presigned_url(event, cors_headers)
-        
+
+            logger.debug("GET request - path: %s, route_key: %s, resource_path: %s",
+                         path, route_key, resource_path)
+
+            if (_PUBLIC_PATH in path
+                    or route_key == 'GET ' + _PUBLIC_PATH
+                    or resource_path == _PUBLIC_PATH):
+                route_path = _PUBLIC_PATH
+
+        route = _ROUTES.get((http_method, route_path))
+        if route is not None:
+            logger.debug("Routing to %s", route.__name__)
+            return route(event, cors_headers)
+
         # Method not allowed
-        print(f"DEBUG: Method not allowed: {http_method}")
+        logger.debug("Method not allowed: %s", http_method)
         return {
             'statusCode': 405,
             'headers': cors_headers,
-            'body': json.dumps({'error': 'Method not allowed'})
+            'body': _ERR_METHOD_NOT_ALLOWED
         }
     except Exception as e:
-        import traceback
-        error_trace = traceback.format_exc()
         error_type = type(e).__name__
-        print(f"ERROR in upload handler: {error_type}: {str(e)}")
-        print(f"Traceback: {error_trace}")
-        print("=" * 80)
+        logger.exception("ERROR in upload handler: %s", error_type)
         return {
             'statusCode': 500,
-            'headers': default_cors_headers,
-            'body': json.dumps({'error': 'Internal server error', 'message': str(e), 'type': error_type})
+            'headers': cors_headers,
+            'body': _dumps({'error': 'Internal server error', 'message': str(e), 'type': error_type})
         }
 
 def generate_presigned_url(event, cors_headers=None):
@@ -180,168 +347,262 @@ def generate_presigned_url(event, cors_headers=None):
         return {
             'statusCode': 401,
             'headers': cors_headers,
-            'body': json.dumps({'error': 'Unauthorized', 'message': 'No user_id found in JWT claims'})
+            'body': _ERR_UNAUTHORIZED
         }
     
+    # Bind the raw body once; the debug print and the error branch below both
+    # reuse it, and the raw string already shows the content so there is no
+    # point re-serializing the parsed dict just to log it
+    body_str = event.get('body') or '{}'
     try:
-        body_str = event.get('body', '{}')
-        print(f"DEBUG: Request body (raw): {body_str}")
-        body = json.loads(body_str)
-        print(f"DEBUG: Request body (parsed): {json.dumps(body)}")
-    except json.JSONDecodeError as e:
+        if _DEBUG:
+            print(f"DEBUG: Request body (raw): {body_str}")
+        body = _loads(body_str)
+    except (json.JSONDecodeError, ValueError) as e:
         print(f"ERROR: Invalid JSON in request body: {str(e)}")
-        print(f"DEBUG: Body string: {event.get('body', '')}")
+        logger.debug("Body string: %s", body_str)
         return {
             'statusCode': 400,
             'headers': cors_headers,
-            'body': json.dumps({'error': 'Invalid JSON in request body', 'details': str(e)})
+            'body': _dumps({'error': 'Invalid JSON in request body', 'details': str(e)})
         }
     except Exception as e:
-        print(f"ERROR: Unexpected error parsing body: {str(e)}")
-        import traceback
-        print(traceback.format_exc())
+        logger.exception("Unexpected error parsing body")
         return {
             'statusCode': 400,
             'headers': cors_headers,
-            'body': json.dumps({'error': 'Error parsing request body', 'details': str(e)})
+            'body': _dumps({'error': 'Error parsing request body', 'details': str(e)})
         }
     
+    # Batch mode: a 'files' list returns one presigned URL per entry in a
+    # single invocation, amortizing auth, CORS handling, and JSON framing
+    # across N signatures (with the cached signing key each extra URL costs
+    # one HMAC chain)
+    files = body.get('files')
+    if files is not None:
+        return _generate_presigned_urls_batch(files, user_id, cors_headers)
+
     file_type = body.get('file_type')  # 'profile_image' or 'resume'
     content_type = body.get('content_type', '').strip().lower()  # Normalize to lowercase
     file_extension = body.get('file_extension', '')
     
-    print(f"DEBUG: file_type={file_type}, content_type={content_type}, file_extension={file_extension}")
+    logger.debug("file_type=%s, content_type=%s, file_extension=%s",
+                 file_type, content_type, file_extension)
     
     if not file_type or not content_type:
         return {
             'statusCode': 400,
             'headers': cors_headers,
-            'body': json.dumps({'error': 'file_type and content_type are required'})
+            'body': _ERR_MISSING_FIELDS
         }
     
-    # Normalize content types for comparison (handle variations like image/jpeg vs image/JPEG)
-    normalized_allowed_images = [ct.lower() for ct in ALLOWED_IMAGE_TYPES]
-    normalized_allowed_resumes = [ct.lower() for ct in ALLOWED_RESUME_TYPES]
-    
-    # Validate MIME type
-    if file_type == 'profile_image':
-        if content_type not in normalized_allowed_images:
-            return {
-                'statusCode': 400,
-                'headers': cors_headers,
-                'body': json.dumps({'error': f'Invalid content type. Allowed: {ALLOWED_IMAGE_TYPES}'})
-            }
-        # Use the normalized content type for the presigned URL
-        # But map common variations to standard forms
-        if content_type == 'image/jpg':
-            content_type = 'image/jpeg'  # Standardize jpg to jpeg
-        prefix = f"users/{user_id}/profile/"
-    elif file_type == 'project_image':
-        if content_type not in normalized_allowed_images:
-            return {
-                'statusCode': 400,
-                'headers': cors_headers,
-                'body': json.dumps({'error': f'Invalid content type. Allowed: {ALLOWED_IMAGE_TYPES}'})
-            }
-        if content_type == 'image/jpg':
-            content_type = 'image/jpeg'
-        prefix = f"users/{user_id}/projects/"
-    elif file_type == 'resume':
-        if content_type not in normalized_allowed_resumes:
-            return {
-                'statusCode': 400,
-                'headers': cors_headers,
-                'body': json.dumps({'error': f'Invalid content type. Allowed: {ALLOWED_RESUME_TYPES}'})
-            }
-        prefix = f"users/{user_id}/resume/"
-    else:
+    # Validate via the precomputed dispatch table instead of an if/elif chain
+    entry = _DISPATCH.get(file_type)
+    if entry is None:
+        return {
+            'statusCode': 400,
+            'headers': cors_headers,
+            'body': _ERR_INVALID_FILE_TYPE
+        }
+    subdir, allowed, allowed_names = entry
+    if content_type not in allowed:
         return {
             'statusCode': 400,
             'headers': cors_headers,
-            'body': json.dumps({'error': 'Invalid file_type. Must be "profile_image", "project_image", or "resume"'})
+            'body': _dumps({'error': f'Invalid content type. Allowed: {allowed_names}'})
         }
+    # Use the canonical form in the signature (standardize jpg to jpeg)
+    content_type = _JPG_CANONICAL.get(content_type, content_type)
+    prefix = f"users/{user_id}/{subdir}"
+
     
-    # Generate unique filename
-    filename = f"{uuid.uuid4()}{file_extension}"
+    # Generate unique filename - urandom bytes straight to hex, skipping
+    # uuid4's field packing and dash formatting
+    filename = f"{os.urandom(16).hex()}{file_extension}"
     key = f"{prefix}{filename}"
     
     # Generate pre-signed URL (valid for 5 minutes)
     # IMPORTANT: Include ContentType in Params so it's part of the signature
     # If Content-Type is sent in the request but not in the signature, S3 will reject it
     try:
-        print(f"DEBUG: About to generate presigned URL with ContentType: {content_type}")
-        # s3_client is already configured with Signature Version 4
+        logger.debug("About to generate presigned URL with ContentType: %s", content_type)
         # Note: With BucketOwnerPreferred, we rely on bucket policy for public access
         # No encryption configured - ensures maximum compatibility for public file access (images and resumes)
-        presigned_url = s3_client.generate_presigned_url(
-            'put_object',
-            Params={
-                'Bucket': bucket_name,
-                'Key': key,
-                'ContentType': content_type,  # Must be included in signature
-            },
-            ExpiresIn=300,  # 5 minutes
-            HttpMethod='PUT'
-        )
-        
-        print(f"DEBUG: Successfully generated presigned URL")
-        # Generate presigned GET URL for viewing (15 minutes expiration)
-        view_url = s3_client.generate_presigned_url(
-            'get_object',
-            Params={
-                'Bucket': bucket_name,
-                'Key': key,
-            },
-            ExpiresIn=900,  # 15 minutes
-            HttpMethod='GET'
-        )
-        
-        print(f"DEBUG: Generated presigned URL for key: {key}")
-        print(f"DEBUG: Content-Type in signature: {content_type}")
+        presigned_url = _fast_presign('PUT', key, 300, content_type=content_type)
+        if not presigned_url:
+            # Fall back to the boto3 presigner (already configured for SigV4)
+            presigned_url = s3_client.generate_presigned_url(
+                'put_object',
+                Params={
+                    'Bucket': bucket_name,
+                    'Key': key,
+                    'ContentType': content_type,  # Must be included in signature
+                },
+                ExpiresIn=300,  # 5 minutes
+                HttpMethod='PUT'
+            )
         
+        logger.debug("Successfully generated presigned URL")
+        logger.debug("Generated presigned URL for key: %s (Content-Type: %s)",
+                     key, content_type)
+
         response_body = {
             'upload_url': presigned_url,
             'key': key,
-            'url': view_url,  # Presigned GET URL instead of public URL
             'content_type': content_type  # Return the Content-Type that was included in the signature
         }
+
+        # Image uploads render response.url directly (ProjectsPage persists it
+        # as image_url), so they keep the view URL by default. Resumes fetch
+        # theirs through /presigned-url after the upload completes, so only
+        # sign one for them when the client explicitly asks.
+        if body.get('return_view_url', file_type != 'resume'):
+            view_url = _fast_presign('GET', key, 900)
+            if not view_url:
+                view_url = s3_client.generate_presigned_url(
+                    'get_object',
+                    Params={
+                        'Bucket': bucket_name,
+                        'Key': key,
+                    },
+                    ExpiresIn=900,  # 15 minutes
+                    HttpMethod='GET'
+                )
+            response_body['url'] = view_url  # Presigned GET URL instead of public URL
         
         response = {
             'statusCode': 200,
             'headers': cors_headers,
-            'body': json.dumps(response_body)
+            'body': _dumps(response_body)
         }
         
-        print(f"DEBUG: Returning response: statusCode={response['statusCode']}, headers={list(response['headers'].keys())}, body_length={len(response['body'])}")
+        if _DEBUG:
+            # Guarded so the keys view and body length aren't computed when
+            # debug logging is off
+            logger.debug("Returning response: statusCode=%s, headers=%s, body_length=%s",
+                         response['statusCode'], response['headers'].keys(), len(response['body']))
         
         return response
     except ParamValidationError as e:
-        import traceback
-        print(f"ERROR: Parameter validation error: {str(e)}")
-        print(f"Traceback: {traceback.format_exc()}")
+        logger.exception("Parameter validation error")
         return {
             'statusCode': 500,
             'headers': cors_headers,
-            'body': json.dumps({'error': 'Parameter validation error', 'message': str(e)})
+            'body': _dumps({'error': 'Parameter validation error', 'message': str(e)})
         }
     except ClientError as e:
-        import traceback
-        print(f"ERROR: S3 ClientError: {str(e)}")
-        print(f"Traceback: {traceback.format_exc()}")
+        logger.exception("S3 ClientError")
         return {
             'statusCode': 500,
             'headers': cors_headers,
-            'body': json.dumps({'error': 'S3 error', 'message': str(e)})
+            'body': _dumps({'error': 'S3 error', 'message': str(e)})
         }
     except Exception as e:
-        import traceback
-        print(f"ERROR: Unexpected error: {str(e)}")
-        print(f"Error type: {type(e).__name__}")
-        print(f"Traceback: {traceback.format_exc()}")
+        logger.exception("Unexpected error generating upload URL")
         return {
             'statusCode': 500,
             'headers': cors_headers,
-            'body': json.dumps({'error': 'Internal server error', 'message': str(e), 'type': type(e).__name__})
+            'body': _dumps({'error': 'Internal server error', 'message': str(e), 'type': type(e).__name__})
+        }
+
+# Per-request ceiling on batch presigns; signing is cheap but unbounded input
+# from a single POST shouldn't be
+_BATCH_MAX_FILES = 20
+
+def _generate_presigned_urls_batch(files, user_id, cors_headers):
+    """Presign upload URLs for a list of file specs in one invocation.
+
+    Each entry takes the same fields as the single-file mode (file_type,
+    content_type, file_extension). Any invalid entry fails the whole batch
+    with a 400 naming the offending index, so clients never end up with a
+    partially signed gallery.
+    """
+    if not isinstance(files, list) or not files:
+        return {
+            'statusCode': 400,
+            'headers': cors_headers,
+            'body': _dumps({'error': 'files must be a non-empty list'})
+        }
+    if len(files) > _BATCH_MAX_FILES:
+        return {
+            'statusCode': 400,
+            'headers': cors_headers,
+            'body': _dumps({'error': f'files is limited to {_BATCH_MAX_FILES} entries per request'})
+        }
+
+    results = []
+    try:
+        for i, spec in enumerate(files):
+            if not isinstance(spec, dict):
+                return {
+                    'statusCode': 400,
+                    'headers': cors_headers,
+                    'body': _dumps({'error': f'files[{i}] must be an object'})
+                }
+            file_type = spec.get('file_type')
+            content_type = (spec.get('content_type') or '').strip().lower()
+            file_extension = spec.get('file_extension', '')
+
+            if not file_type or not content_type:
+                return {
+                    'statusCode': 400,
+                    'headers': cors_headers,
+                    'body': _dumps({'error': f'files[{i}]: file_type and content_type are required'})
+                }
+            entry = _DISPATCH.get(file_type)
+            if entry is None:
+                return {
+                    'statusCode': 400,
+                    'headers': cors_headers,
+                    'body': _dumps({'error': f'files[{i}]: Invalid file_type. Must be "profile_image", "project_image", or "resume"'})
+                }
+            subdir, allowed, allowed_names = entry
+            if content_type not in allowed:
+                return {
+                    'statusCode': 400,
+                    'headers': cors_headers,
+                    'body': _dumps({'error': f'files[{i}]: Invalid content type. Allowed: {allowed_names}'})
+                }
+            content_type = _JPG_CANONICAL.get(content_type, content_type)
+
+            key = f"users/{user_id}/{subdir}{os.urandom(16).hex()}{file_extension}"
+            upload_url = _fast_presign('PUT', key, 300, content_type=content_type)
+            if not upload_url:
+                upload_url = s3_client.generate_presigned_url(
+                    'put_object',
+                    Params={
+                        'Bucket': bucket_name,
+                        'Key': key,
+                        'ContentType': content_type,
+                    },
+                    ExpiresIn=300,
+                    HttpMethod='PUT'
+                )
+            results.append({
+                'upload_url': upload_url,
+                'key': key,
+                'content_type': content_type
+            })
+
+        logger.debug("Generated %s presigned URLs in batch", len(results))
+        return {
+            'statusCode': 200,
+            'headers': cors_headers,
+            'body': _dumps({'files': results})
+        }
+    except ClientError as e:
+        logger.exception("S3 ClientError")
+        return {
+            'statusCode': 500,
+            'headers': cors_headers,
+            'body': _dumps({'error': 'S3 error', 'message': str(e)})
+        }
+    except Exception as e:
+        logger.exception("Unexpected error generating batch upload URLs")
+        return {
+            'statusCode': 500,
+            'headers': cors_headers,
+            'body': _dumps({'error': 'Internal server error', 'message': str(e), 'type': type(e).__name__})
         }
 
 def generate_presigned_get_url(event, cors_headers=None):
@@ -357,7 +618,7 @@ def generate_presigned_get_url(event, cors_headers=None):
         return {
             'statusCode': 401,
             'headers': cors_headers,
-            'body': json.dumps({'error': 'Unauthorized', 'message': 'No user_id found in JWT claims'})
+            'body': _ERR_UNAUTHORIZED
         }
     
     # Get key from query string
@@ -379,27 +640,31 @@ def generate_presigned_get_url(event, cors_headers=None):
             return {
                 'statusCode': 400,
                 'headers': cors_headers,
-                'body': json.dumps({'error': 'key parameter is required'})
+                'body': _ERR_KEY_REQUIRED
             }
         
-        # Validate that the key belongs to the requesting user
-        if not key.startswith(f"users/{user_id}/"):
+        # Validate that the key belongs to the requesting user; slice
+        # comparison against a prebuilt prefix skips a per-call f-string
+        prefix = 'users/' + user_id + '/'
+        if key[:len(prefix)] != prefix:
             return {
                 'statusCode': 403,
                 'headers': cors_headers,
-                'body': json.dumps({'error': 'Forbidden', 'message': 'You can only access your own files'})
+                'body': _ERR_FORBIDDEN_OWN_FILES
             }
         
         # Generate presigned GET URL (15 minutes expiration)
-        presigned_url = s3_client.generate_presigned_url(
-            'get_object',
-            Params={
-                'Bucket': bucket_name,
-                'Key': key,
-            },
-            ExpiresIn=900,  # 15 minutes
-            HttpMethod='GET'
-        )
+        presigned_url = _fast_presign('GET', key, 900)
+        if not presigned_url:
+            presigned_url = s3_client.generate_presigned_url(
+                'get_object',
+                Params={
+                    'Bucket': bucket_name,
+                    'Key': key,
+                },
+                ExpiresIn=900,  # 15 minutes
+                HttpMethod='GET'
+            )
         
         response_body = {
             'url': presigned_url,
@@ -410,7 +675,7 @@ def generate_presigned_get_url(event, cors_headers=None):
         return {
             'statusCode': 200,
             'headers': cors_headers,
-            'body': json.dumps(response_body)
+            'body': _dumps(response_body)
         }
         
     except ClientError as e:
@@ -418,16 +683,14 @@ def generate_presigned_get_url(event, cors_headers=None):
         return {
             'statusCode': 500,
             'headers': cors_headers,
-            'body': json.dumps({'error': 'S3 error', 'message': str(e)})
+            'body': _dumps({'error': 'S3 error', 'message': str(e)})
         }
     except Exception as e:
-        print(f"ERROR: Unexpected error: {str(e)}")
-        import traceback
-        print(traceback.format_exc())
+        logger.exception("Unexpected error")
         return {
             'statusCode': 500,
             'headers': cors_headers,
-            'body': json.dumps({'error': 'Internal server error', 'message': str(e)})
+            'body': _dumps({'error': 'Internal server error', 'message': str(e)})
         }
 
 def generate_presigned_get_url_public(event, cors_headers=None):
@@ -452,59 +715,85 @@ def generate_presigned_get_url_public(event, cors_headers=None):
         
         key = query_string.get('key')
         
-        print(f"DEBUG: Public presigned URL request - key: {key}, query_string: {query_string}, event keys: {list(event.keys())}")
+        logger.debug("Public presigned URL request - key: %s, query_string: %s, event keys: %s",
+                     key, query_string, event.keys())
         
         if not key:
             print("ERROR: key parameter is missing")
             return {
                 'statusCode': 400,
                 'headers': cors_headers,
-                'body': json.dumps({'error': 'key parameter is required', 'message': 'key parameter is required'})
+                'body': _ERR_KEY_REQUIRED_PUBLIC
             }
         
         # Only allow public access to profile images and resumes (public profile assets)
         # Pattern: users/{user_id}/profile/* or users/{user_id}/resume/*
-        key_parts = key.split('/')
-        print(f"DEBUG: Key parts: {key_parts}, length: {len(key_parts)}")
-        
-        if len(key_parts) < 3 or key_parts[0] != 'users' or key_parts[2] not in ['profile', 'resume']:
-            print(f"ERROR: Invalid key pattern - key_parts: {key_parts}")
+        # Checked with str.find instead of key.split('/') so validation
+        # doesn't allocate a list of segments per request
+        if key[:6] == 'users/':
+            sep = key.find('/', 6)  # end of the user_id segment
+        else:
+            sep = -1
+        if sep == -1:
+            segment = None
+        else:
+            end = key.find('/', sep + 1)
+            segment = key[sep + 1:end] if end != -1 else key[sep + 1:]
+
+        if segment not in ('profile', 'resume'):
+            print(f"ERROR: Invalid key pattern - key: {key}")
             return {
                 'statusCode': 403,
                 'headers': cors_headers,
-                'body': json.dumps({
-                    'error': 'Forbidden',
-                    'message': 'Public presigned URLs are only available for profile images and resumes'
-                })
+                'body': _ERR_FORBIDDEN_PUBLIC
             }
         
+        # Serve from the warm-container cache when a still-fresh URL exists
+        # for this key - a popular profile page hits the same key repeatedly
+        now = time.time()
+        hit = _PUBLIC_URL_CACHE.get(key)
+        if hit is not None and hit[1] - now > _PUBLIC_URL_MARGIN:
+            _PUBLIC_URL_CACHE.move_to_end(key)
+            return {
+                'statusCode': 200,
+                'headers': cors_headers,
+                'body': _dumps({'url': hit[0], 'key': key, 'expires_in': int(hit[1] - now)})
+            }
+
         # Generate presigned GET URL (15 minutes expiration)
-        print(f"DEBUG: Generating presigned URL for bucket: {bucket_name}, key: {key}")
+        logger.debug("Generating presigned URL for bucket: %s, key: %s", bucket_name, key)
         
         if not s3_client or not bucket_name:
             print(f"ERROR: S3 client or bucket name not configured - s3_client: {bool(s3_client)}, bucket_name: {bucket_name}")
             return {
                 'statusCode': 500,
                 'headers': cors_headers,
-                'body': json.dumps({
+                'body': _dumps({
                     'error': 'Internal server error',
                     'message': 'S3 client not configured'
                 })
             }
         
         try:
-            presigned_url = s3_client.generate_presigned_url(
-                'get_object',
-                Params={
-                    'Bucket': bucket_name,
-                    'Key': key,
-                },
-                ExpiresIn=900,  # 15 minutes
-                HttpMethod='GET'
-            )
-            
-            print(f"DEBUG: Successfully generated presigned URL")
+            presigned_url = _fast_presign('GET', key, 900)
+            if not presigned_url:
+                presigned_url = s3_client.generate_presigned_url(
+                    'get_object',
+                    Params={
+                        'Bucket': bucket_name,
+                        'Key': key,
+                    },
+                    ExpiresIn=900,  # 15 minutes
+                    HttpMethod='GET'
+                )
             
+            logger.debug("Successfully generated presigned URL")
+
+            _PUBLIC_URL_CACHE[key] = (presigned_url, now + _PUBLIC_URL_TTL)
+            _PUBLIC_URL_CACHE.move_to_end(key)
+            if len(_PUBLIC_URL_CACHE) > _PUBLIC_URL_CACHE_MAX:
+                _PUBLIC_URL_CACHE.popitem(last=False)
+
             response_body = {
                 'url': presigned_url,
                 'key': key,
@@ -514,16 +803,14 @@ def generate_presigned_get_url_public(event, cors_headers=None):
             return {
                 'statusCode': 200,
                 'headers': cors_headers,
-                'body': json.dumps(response_body)
+                'body': _dumps(response_body)
             }
         except Exception as e:
-            print(f"ERROR: Failed to generate presigned URL: {str(e)}")
-            import traceback
-            print(traceback.format_exc())
+            logger.exception("Failed to generate presigned URL")
             return {
                 'statusCode': 500,
                 'headers': cors_headers,
-                'body': json.dumps({
+                'body': _dumps({
                     'error': 'Internal server error',
                     'message': f'Failed to generate presigned URL: {str(e)}'
                 })
@@ -534,14 +821,21 @@ def generate_presigned_get_url_public(event, cors_headers=None):
         return {
             'statusCode': 500,
             'headers': cors_headers,
-            'body': json.dumps({'error': 'S3 error', 'message': str(e)})
+            'body': _dumps({'error': 'S3 error', 'message': str(e)})
         }
     except Exception as e:
-        print(f"ERROR: Unexpected error: {str(e)}")
-        import traceback
-        print(traceback.format_exc())
+        logger.exception("Unexpected error")
         return {
             'statusCode': 500,
             'headers': cors_headers,
-            'body': json.dumps({'error': 'Internal server error', 'message': str(e)})
-        }
\ No newline at end of file
+            'body': _dumps({'error': 'Internal server error', 'message': str(e)})
+        }
+# (method, public-path marker) -> handler, resolved with a single dict lookup
+# in handler(). Defined last so all route handlers exist when the table is
+# built; OPTIONS never reaches this table (answered from _PREFLIGHT).
+_PUBLIC_PATH = '/public/presigned-url'
+_ROUTES = {
+    ('POST', None): generate_presigned_url,
+    ('GET', _PUBLIC_PATH): generate_presigned_get_url_public,
+    ('GET', None): generate_presigned_get_url,
+}